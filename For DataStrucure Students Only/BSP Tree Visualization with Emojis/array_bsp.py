@@ -0,0 +1,155 @@
+import numpy as np
+import pygame
+
+# Array-Backed BSP Tree
+class ArrayBSPTree:
+    """2D BSP (kd) tree over points, stored in flat NumPy arrays.
+
+    Items are reordered so that every node owns a contiguous slice of
+    `order`. A node with more than `leaf_size` items is split at the median
+    of the longer side of its bounding box (np.argpartition, so each level
+    costs O(n) and the build O(n log n)); smaller nodes are leaves. The build
+    uses an explicit stack instead of recursion.
+
+    Queries walk the tree a level at a time with the whole frontier as
+    arrays, pruning nodes by bounding box, and then test every item in the
+    surviving leaves in one vectorized pass.
+    """
+    def __init__(self, x, y, leaf_size=32):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n = len(x)
+        self.leaf_size = leaf_size
+        self.order = np.arange(n)  # Tree position -> original item index
+        start, end, left, right, axis, split, bounds = [], [], [], [], [], [], []
+
+        def new_node(first, last):
+            start.append(first)
+            end.append(last)
+            left.append(-1)      # -1 marks a leaf
+            right.append(-1)
+            axis.append(-1)      # 0 = split on x, 1 = split on y
+            split.append(np.nan)
+            bounds.append(None)  # (min_x, min_y, max_x, max_y)
+            return len(start) - 1
+
+        stack = [new_node(0, n)] if n else []
+        while stack:
+            node = stack.pop()
+            first, last = start[node], end[node]
+            items = self.order[first:last]
+            xs, ys = x[items], y[items]
+            bounds[node] = (xs.min(), ys.min(), xs.max(), ys.max())
+            if last - first <= leaf_size:
+                continue
+
+            # Split at the median of the longer side
+            node_axis = 0 if np.ptp(xs) >= np.ptp(ys) else 1
+            coordinates = xs if node_axis == 0 else ys
+            middle = (last - first) // 2
+            partition = np.argpartition(coordinates, middle)
+            self.order[first:last] = items[partition]
+            axis[node] = node_axis
+            split[node] = coordinates[partition[middle]]
+            left[node] = new_node(first, first + middle)
+            right[node] = new_node(first + middle, last)
+            stack += [left[node], right[node]]
+
+        self.start = np.array(start, dtype=np.intp)
+        self.end = np.array(end, dtype=np.intp)
+        self.left = np.array(left, dtype=np.intp)
+        self.right = np.array(right, dtype=np.intp)
+        self.axis = np.array(axis, dtype=np.int8)
+        self.split = np.array(split)
+        self.bounds = np.array(bounds, dtype=float).reshape(-1, 4)
+        self.x = x[self.order]  # Coordinates in tree order, so leaf slices are contiguous
+        self.y = y[self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def leaves_where(self, keep):
+        """Leaves reached by descending only into nodes for which keep(bounds) is True."""
+        if len(self.start) == 0:
+            return np.empty(0, dtype=np.intp)
+        frontier = np.zeros(1, dtype=np.intp)
+        leaves = []
+        while len(frontier):
+            frontier = frontier[keep(self.bounds[frontier].T)]
+            is_leaf = self.left[frontier] < 0
+            leaves.append(frontier[is_leaf])
+            inner = frontier[~is_leaf]
+            frontier = np.concatenate((self.left[inner], self.right[inner]))
+        return np.concatenate(leaves)
+
+    def slots(self, leaves):
+        """Tree positions of every item in the given leaves."""
+        counts = self.end[leaves] - self.start[leaves]
+        offsets = np.repeat(self.start[leaves] - (np.cumsum(counts) - counts), counts)
+        return offsets + np.arange(counts.sum())
+
+    def query_rect(self, left, top, right, bottom):
+        """Original indices of the items inside the rectangle (edges included)."""
+        def overlaps(bounds):
+            min_x, min_y, max_x, max_y = bounds
+            return (max_x >= left) & (min_x <= right) & (max_y >= top) & (min_y <= bottom)
+
+        slots = self.slots(self.leaves_where(overlaps))
+        x, y = self.x[slots], self.y[slots]
+        return self.order[slots[(x >= left) & (x <= right) & (y >= top) & (y <= bottom)]]
+
+    def query_radius(self, center_x, center_y, radius):
+        """Original indices of the items within radius of the center."""
+        def near(bounds):
+            return box_distance_squared(bounds, center_x, center_y) <= radius ** 2
+
+        slots = self.slots(self.leaves_where(near))
+        inside = (self.x[slots] - center_x) ** 2 + (self.y[slots] - center_y) ** 2 <= radius ** 2
+        return self.order[slots[inside]]
+
+    def query_visible(self, viewer_x, viewer_y, fade, view_rect):
+        """Original indices and opacities of items inside view_rect with opacity > 0.
+
+        Opacity is 1 - distance / fade, so only items closer than `fade` to
+        the viewer count.
+        """
+        left, top, right, bottom = view_rect
+
+        def visible(bounds):
+            min_x, min_y, max_x, max_y = bounds
+            return ((max_x >= left) & (min_x <= right) & (max_y >= top) & (min_y <= bottom) &
+                    (box_distance_squared(bounds, viewer_x, viewer_y) < fade ** 2))
+
+        slots = self.slots(self.leaves_where(visible))
+        x, y = self.x[slots], self.y[slots]
+        opacity = 1 - np.hypot(x - viewer_x, y - viewer_y) / fade
+        shown = (opacity > 0) & (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+        return self.order[slots[shown]], opacity[shown]
+
+def box_distance_squared(bounds, x, y):
+    """Squared distance from (x, y) to each bounding box (0 inside it)."""
+    min_x, min_y, max_x, max_y = bounds
+    dx = np.maximum(np.maximum(min_x - x, x - max_x), 0)
+    dy = np.maximum(np.maximum(min_y - y, y - max_y), 0)
+    return dx * dx + dy * dy
+
+def fade_levels(image, levels):
+    """Copies of image with alpha multiplied by `levels` evenly spaced opacities, index 0 = transparent."""
+    faded = []
+    for level in range(levels):
+        surface = image.copy()
+        surface.fill((255, 255, 255, round(level / (levels - 1) * 255)), special_flags=pygame.BLEND_RGBA_MULT)
+        faded.append(surface)
+    return faded
+
+def draw_visible(screen, sprites, kinds, x, y, items, opacities):
+    """Blit items with one screen.blits call.
+
+    sprites[kind] holds that sprite at evenly spaced opacity levels (see
+    fade_levels); each item is drawn at the level nearest its opacity.
+    """
+    levels = len(sprites[0])
+    flat = [surface for kind in sprites for surface in kind]
+    index = kinds[items] * levels + np.rint(opacities * (levels - 1)).astype(int)
+    screen.blits(zip(map(flat.__getitem__, index.tolist()), zip(x[items].tolist(), y[items].tolist())),
+                 doreturn=False)
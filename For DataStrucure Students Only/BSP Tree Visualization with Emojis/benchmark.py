@@ -0,0 +1,71 @@
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window needed
+
+import numpy as np
+import pygame
+
+from array_bsp import ArrayBSPTree, draw_visible, fade_levels
+
+# Benchmark Settings (same screen, sprite size and opacity rule as script.py)
+WINDOW_WIDTH = 1600
+WINDOW_HEIGHT = 1200
+EMOJI_SIZE = 40
+OPACITY_LEVELS = 32
+KINDS = 8  # Distinct sprites, like the 8 emojis
+SPRITE_COUNTS = (50, 500, 5000, 50000, 100000)
+FRAMES = 30
+SEED = 0
+VIEW_RECT = (-EMOJI_SIZE, -EMOJI_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT)
+FADE = max(WINDOW_WIDTH, WINDOW_HEIGHT)
+
+def make_sprites():
+    """A colored disc per kind, baked at every opacity level (stands in for the emoji glyphs)."""
+    sprites = []
+    for kind in range(KINDS):
+        disc = pygame.Surface((EMOJI_SIZE, EMOJI_SIZE), pygame.SRCALPHA)
+        color = pygame.Color(0)
+        color.hsva = (kind * 360 / KINDS, 80, 100, 100)
+        pygame.draw.circle(disc, color, (EMOJI_SIZE // 2, EMOJI_SIZE // 2), EMOJI_SIZE // 2)
+        disc = disc.convert_alpha()
+        sprites.append(fade_levels(disc, OPACITY_LEVELS))
+    return sprites
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    sprites = make_sprites()
+    rng = np.random.default_rng(SEED)
+
+    print(f"{FRAMES} frames per count, viewer moving across the screen")
+    print(f"{'sprites':>8} {'visible':>8} {'build (ms)':>11} {'query (ms)':>11} {'draw (ms)':>10} {'frame (ms)':>11}")
+    for count in SPRITE_COUNTS:
+        kinds = rng.integers(0, KINDS, count)
+        x = rng.integers(0, WINDOW_WIDTH + 1, count)
+        y = rng.integers(0, WINDOW_HEIGHT + 1, count)
+
+        start = time.perf_counter()
+        tree = ArrayBSPTree(x, y)
+        build = time.perf_counter() - start
+
+        query = draw = frame = visible = 0
+        for i in range(FRAMES):
+            viewer_x = i * WINDOW_WIDTH // FRAMES
+            viewer_y = i * WINDOW_HEIGHT // FRAMES
+            frame_start = time.perf_counter()
+            screen.fill((30, 30, 30))
+            items, opacities = tree.query_visible(viewer_x, viewer_y, FADE, VIEW_RECT)
+            queried = time.perf_counter()
+            draw_visible(screen, sprites, kinds, x, y, items, opacities)
+            drawn = time.perf_counter()
+            pygame.display.flip()
+            frame += time.perf_counter() - frame_start
+            query += queried - frame_start
+            draw += drawn - queried
+            visible += len(items)
+
+        print(f"{count:>8} {visible // FRAMES:>8} {build * 1000:>11.1f} {query / FRAMES * 1000:>11.2f} "
+              f"{draw / FRAMES * 1000:>10.2f} {frame / FRAMES * 1000:>11.2f}")
+
+    pygame.quit()
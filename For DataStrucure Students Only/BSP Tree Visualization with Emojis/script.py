@@ -1,8 +1,15 @@
+import os
+import shutil
+import subprocess
 import pygame
 import random
 import math
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+from array_bsp import ArrayBSPTree, draw_visible, fade_levels
+from frame_profiler import FrameProfiler
+
 # Initialize pygame
 pygame.init()
 
@@ -10,7 +17,10 @@ pygame.init()
 WINDOW_WIDTH = 1600
 WINDOW_HEIGHT = 1200
 NUM_EMOJIS = 50
+TREE = 'array'         # 'array' (flat NumPy tree, scales to 100k emojis) or 'nodes' (one BSPNode per emoji)
 EMOJI_SIZE = 40
+OPACITY_LEVELS = 32    # Pre-rendered opacity steps per emoji (the nearest one is drawn)
+SHOW_PROFILER = False  # Per-phase frame times overlay (F3 toggles it while running)
 
 # Colors
 BACKGROUND_COLOR = (30, 30, 30)
@@ -18,6 +28,20 @@ BACKGROUND_COLOR = (30, 30, 30)
 # Emojis to render
 EMOJIS = ["😀", "🎉", "🌟", "🔥", "🍕", "🐱", "🚀", "🌍"]
 
+# Emoji fonts to try, in order (fc-match and then a plain font are tried after these)
+EMOJI_FONT_PATHS = [
+    "/System/Library/Fonts/Apple Color Emoji.ttc",            # macOS
+    "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",      # Debian / Ubuntu (fonts-noto-color-emoji)
+    "/usr/share/fonts/noto/NotoColorEmoji.ttf",               # Arch
+    "/usr/share/fonts/google-noto-emoji/NotoColorEmoji.ttf",  # Fedora
+    "C:/Windows/Fonts/seguiemj.ttf",                          # Windows
+]
+FALLBACK_FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+]
+BITMAP_FONT_SIZES = [160, 137, 109, 96, 64, 48, 40, 32, 20]  # Fixed sizes color emoji fonts ship with
+
 # Initialize screen
 screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 pygame.display.set_caption("BSP Tree Emoji Renderer")
@@ -31,94 +55,263 @@ emoji_data = [
     for _ in range(NUM_EMOJIS)
 ]
 
-def create_emoji_surface(emoji, size):
-    font_path = "/System/Library/Fonts/Apple Color Emoji.ttc"  # Path to .ttc file
-    font = ImageFont.truetype(font_path, size, index=0)  # Use font face index 0
-    img = Image.new("RGBA", (size, size), (255, 255, 255, 0))  # Transparent background
-    draw = ImageDraw.Draw(img)
-    draw.text((0, 0), emoji, font=font, fill=(255, 255, 255, 255))  # Draw emoji
-    return pygame.image.fromstring(img.tobytes(), img.size, img.mode)
+# Find an emoji font on this machine
+def find_emoji_font():
+    for path in EMOJI_FONT_PATHS:
+        if os.path.exists(path):
+            return path
+    if shutil.which("fc-match"):  # Linux: ask fontconfig for its best emoji font
+        result = subprocess.run(["fc-match", "-f", "%{file}", "emoji"], capture_output=True, text=True)
+        if result.returncode == 0 and os.path.exists(result.stdout):
+            return result.stdout
+    for path in FALLBACK_FONT_PATHS:
+        if os.path.exists(path):
+            return path
+    return None  # Use PIL's built-in font
+
+# Glyph and Font Cache
+class GlyphCache:
+    """Emoji surfaces keyed by (emoji, size), rendered from one cached font.
+
+    The font file is opened once per size and each distinct glyph is
+    rendered and converted to a pygame surface once, so startup cost grows
+    with the number of distinct emojis rather than with NUM_EMOJIS. Color
+    emoji fonts only come in a few fixed sizes, so those are rendered at a
+    size the font has and scaled to the one asked for.
+    """
+    def __init__(self, font_path=None):
+        self.font_path = font_path if font_path is not None else find_emoji_font()
+        self.fonts = {}   # size -> (font, size it renders at)
+        self.glyphs = {}  # (emoji, size) -> surface
+        self.faded = {}   # (emoji, size, levels) -> surfaces from transparent to opaque
+
+    def font(self, size):
+        if size not in self.fonts:
+            self.fonts[size] = self.load_font(size)
+        return self.fonts[size]
+
+    def load_font(self, size):
+        if self.font_path is None:
+            return ImageFont.load_default(size), size
+        for render_size in [size] + BITMAP_FONT_SIZES:
+            try:
+                return ImageFont.truetype(self.font_path, render_size, index=0), render_size
+            except OSError:
+                continue  # Not a size this font has
+        raise OSError(f"Could not load {self.font_path} at any size")
+
+    def get(self, emoji, size):
+        key = (emoji, size)
+        if key not in self.glyphs:
+            self.glyphs[key] = self.render(emoji, size)
+        return self.glyphs[key]
+
+    def get_faded(self, emoji, size, levels=OPACITY_LEVELS):
+        """The glyph baked at `levels` evenly spaced opacities, index 0 = transparent."""
+        key = (emoji, size, levels)
+        if key not in self.faded:
+            glyph = self.get(emoji, size)
+            self.faded[key] = fade_levels(glyph, levels)
+        return self.faded[key]
+
+    def render(self, emoji, size):
+        font, render_size = self.font(size)
+        img = Image.new("RGBA", (render_size, render_size), (255, 255, 255, 0))  # Transparent background
+        draw = ImageDraw.Draw(img)
+        draw.text((0, 0), emoji, font=font, fill=(255, 255, 255, 255), embedded_color=True)  # Draw emoji
+        if render_size != size:
+            img = img.resize((size, size), Image.LANCZOS)
+        return pygame.image.fromstring(img.tobytes(), img.size, img.mode).convert_alpha()
 
-# Create surfaces for emojis
+# Create surfaces for emojis (instances of the same emoji share one set of opacity levels)
+glyphs = GlyphCache()
 emoji_surfaces = [
     {
-        "surface": create_emoji_surface(data["emoji"], EMOJI_SIZE),
+        "sprites": glyphs.get_faded(data["emoji"], EMOJI_SIZE),
         "position": data["position"],
     }
     for data in emoji_data
 ]
 
-# BSP Node class
+# BSP Node class (a 2D kd-tree node: splits on x at even depths and on y at odd depths)
 class BSPNode:
-    def __init__(self, x, y, surface, left=None, right=None):
+    def __init__(self, x, y, sprites, axis=0, left=None, right=None):
         self.x = x
         self.y = y
-        self.surface = surface
-        self.left = left
-        self.right = right
+        self.sprites = sprites  # The emoji at each opacity level
+        self.axis = axis  # 0 = split on x, 1 = split on y
+        self.left = left    # Items with coordinate <= the split on this axis
+        self.right = right  # Items with coordinate >= the split on this axis
+        self.bounds = (x, y, x, y)  # (min_x, min_y, max_x, max_y) of this whole subtree
 
-    def insert(self, obj_x, obj_y, obj_surface):
-        if obj_x < self.x:
+    def update_bounds(self):
+        min_x, min_y, max_x, max_y = self.x, self.y, self.x, self.y
+        for child in (self.left, self.right):
+            if child is not None:
+                min_x, min_y = min(min_x, child.bounds[0]), min(min_y, child.bounds[1])
+                max_x, max_y = max(max_x, child.bounds[2]), max(max_y, child.bounds[3])
+        self.bounds = (min_x, min_y, max_x, max_y)
+
+    def split(self):
+        return self.x if self.axis == 0 else self.y
+
+    def insert(self, obj_x, obj_y, obj_sprites):
+        min_x, min_y, max_x, max_y = self.bounds
+        self.bounds = (min(min_x, obj_x), min(min_y, obj_y), max(max_x, obj_x), max(max_y, obj_y))
+        coordinate = obj_x if self.axis == 0 else obj_y
+        if coordinate < self.split():
             if self.left is None:
-                self.left = BSPNode(obj_x, obj_y, obj_surface)
+                self.left = BSPNode(obj_x, obj_y, obj_sprites, 1 - self.axis)
             else:
-                self.left.insert(obj_x, obj_y, obj_surface)
+                self.left.insert(obj_x, obj_y, obj_sprites)
         else:
             if self.right is None:
-                self.right = BSPNode(obj_x, obj_y, obj_surface)
+                self.right = BSPNode(obj_x, obj_y, obj_sprites, 1 - self.axis)
             else:
-                self.right.insert(obj_x, obj_y, obj_surface)
+                self.right.insert(obj_x, obj_y, obj_sprites)
+
+    def query_radius(self, center_x, center_y, radius):
+        """Nodes within `radius` of the center, skipping subtrees on the far side of a split."""
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if (node.x - center_x) ** 2 + (node.y - center_y) ** 2 <= radius ** 2:
+                found.append(node)
+            center = center_x if node.axis == 0 else center_y
+            if node.left is not None and center - radius <= node.split():
+                stack.append(node.left)
+            if node.right is not None and center + radius >= node.split():
+                stack.append(node.right)
+        return found
+
+    def query_rect(self, left, top, right, bottom):
+        """Nodes inside the rectangle (edges included), skipping subtrees outside it."""
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if left <= node.x <= right and top <= node.y <= bottom:
+                found.append(node)
+            low, high = (left, right) if node.axis == 0 else (top, bottom)
+            if node.left is not None and low <= node.split():
+                stack.append(node.left)
+            if node.right is not None and high >= node.split():
+                stack.append(node.right)
+        return found
+
+    def query_visible(self, viewer_x, viewer_y, view_rect):
+        """(node, opacity) for every node with opacity > 0 inside view_rect.
+
+        Opacity falls to zero at max(WINDOW_WIDTH, WINDOW_HEIGHT) from the
+        viewer, so a subtree is skipped whole when its bounding box is at
+        least that far away or lies outside view_rect (left, top, right, bottom).
+        """
+        left, top, right, bottom = view_rect
+        fade = max(WINDOW_WIDTH, WINDOW_HEIGHT)
+        visible = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            min_x, min_y, max_x, max_y = node.bounds
+            if max_x < left or min_x > right or max_y < top or min_y > bottom:
+                continue
+            dx = max(min_x - viewer_x, 0, viewer_x - max_x)
+            dy = max(min_y - viewer_y, 0, viewer_y - max_y)
+            if dx * dx + dy * dy >= fade * fade:
+                continue
+            if left <= node.x <= right and top <= node.y <= bottom:
+                opacity = node.is_visible(viewer_x, viewer_y)
+                if opacity > 0:
+                    visible.append((node, opacity))
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        return visible
 
     def is_visible(self, viewer_x, viewer_y):
         distance = math.sqrt((self.x - viewer_x) ** 2 + (self.y - viewer_y) ** 2)
         return max(0, 1 - distance / max(WINDOW_WIDTH, WINDOW_HEIGHT))  # Opacity based on distance
 
-# Build a BSP tree
+# Build a balanced BSP tree from (x, y, sprites) tuples in O(n log n)
 def build_bsp_tree(objects):
-    if not objects:
+    # Sort once per axis; each level then splits both orders around the median in O(n)
+    by_x = sorted(range(len(objects)), key=lambda i: objects[i][0])
+    by_y = sorted(range(len(objects)), key=lambda i: objects[i][1])
+    return build_bsp_subtree(objects, by_x, by_y, 0)
+
+def build_bsp_subtree(objects, by_x, by_y, axis):
+    if not by_x:
         return None
-    median = len(objects) // 2
-    x, y, surface = objects[median]
-    node = BSPNode(x, y, surface)
-    node.left = build_bsp_tree(objects[:median])
-    node.right = build_bsp_tree(objects[median + 1 :])
+    ordered = by_x if axis == 0 else by_y
+    median = len(ordered) // 2
+    x, y, sprites = objects[ordered[median]]
+    node = BSPNode(x, y, sprites, axis)
+
+    # Keep both orders for each half, so the children can pick their medians directly
+    left_items = set(ordered[:median])
+    right_items = set(ordered[median + 1:])
+    node.left = build_bsp_subtree(objects, [i for i in by_x if i in left_items],
+                                  [i for i in by_y if i in left_items], 1 - axis)
+    node.right = build_bsp_subtree(objects, [i for i in by_x if i in right_items],
+                                   [i for i in by_y if i in right_items], 1 - axis)
+    node.update_bounds()
     return node
 
 # Prepare emoji data and build BSP tree
-sorted_positions = sorted(
-    [(e["position"][0], e["position"][1], e["surface"]) for e in emoji_surfaces], key=lambda p: p[0]
-)
-bsp_tree = build_bsp_tree(sorted_positions)
+if TREE == 'array':
+    emoji_sprites = [glyphs.get_faded(emoji, EMOJI_SIZE) for emoji in EMOJIS]
+    emoji_kinds = np.array([EMOJIS.index(data["emoji"]) for data in emoji_data])
+    emoji_x = np.array([data["position"][0] for data in emoji_data])
+    emoji_y = np.array([data["position"][1] for data in emoji_data])
+    bsp_tree = ArrayBSPTree(emoji_x, emoji_y)
+else:
+    bsp_tree = build_bsp_tree([(e["position"][0], e["position"][1], e["sprites"]) for e in emoji_surfaces])
+
+# Positions whose emoji overlaps the screen (emojis are drawn from their top-left corner)
+VIEW_RECT = (-EMOJI_SIZE, -EMOJI_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT)
 
 # Render emojis based on visibility
 def render_emojis(tree, viewer_x, viewer_y):
+    if TREE == 'array':
+        items, opacities = tree.query_visible(viewer_x, viewer_y, max(WINDOW_WIDTH, WINDOW_HEIGHT), VIEW_RECT)
+        draw_visible(screen, emoji_sprites, emoji_kinds, emoji_x, emoji_y, items, opacities)
+        return
     if tree is None:
         return
-    opacity = tree.is_visible(viewer_x, viewer_y)
-    x, y = tree.x, tree.y
-    if opacity > 0:
-        surface = tree.surface.copy()
-        surface.set_alpha(int(opacity * 255))
-        screen.blit(surface, (x, y))
-    render_emojis(tree.left, viewer_x, viewer_y)
-    render_emojis(tree.right, viewer_x, viewer_y)
+    # Pick the nearest pre-rendered opacity; nothing is allocated per emoji
+    top_level = OPACITY_LEVELS - 1
+    screen.blits([(node.sprites[round(opacity * top_level)], (node.x, node.y))
+                  for node, opacity in tree.query_visible(viewer_x, viewer_y, VIEW_RECT)],
+                 doreturn=False)
 
 # Main loop
+profiler = FrameProfiler(phases=('event', 'draw', 'flip'))
 running = True
 while running:
+    profiler.begin()
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            SHOW_PROFILER = not SHOW_PROFILER
 
     # Get mouse position as viewer position
     viewer_x, viewer_y = pygame.mouse.get_pos()
+    profiler.mark('event')
 
     # Clear screen
     screen.fill(BACKGROUND_COLOR)
 
     # Render emojis based on viewer position
     render_emojis(bsp_tree, viewer_x, viewer_y)
+    if SHOW_PROFILER:
+        profiler.draw(screen)
+    profiler.mark('draw')
 
     pygame.display.flip()
+    profiler.mark('flip')
+    profiler.end_frame()
 
 pygame.quit()
\ No newline at end of file
@@ -1,3 +1,5 @@
+import json
+
 import numpy as np
 
 class Boid:
@@ -8,19 +10,30 @@ class Boid:
         self.vy = vy
 
 class BoidSimulation:
-    def __init__(self, num_boids, width, height, params):
+    def __init__(self, num_boids, width, height, params, seed=None):
+        # All randomness goes through this generator so runs are reproducible
+        self.rng = np.random.default_rng(seed)
         self.boids = [Boid(
-            np.random.uniform(0, width),
-            np.random.uniform(0, height),
-            np.random.uniform(-1, 1),
-            np.random.uniform(-1, 1)
+            self.rng.uniform(0, width),
+            self.rng.uniform(0, height),
+            self.rng.uniform(-1, 1),
+            self.rng.uniform(-1, 1)
         ) for _ in range(num_boids)]
-        
+
         self.width = width
         self.height = height
         self.params = params
+        self.step_count = 0
 
     def update(self):
+        self.step_count += 1
+
+        # Topological mode: only the k nearest visible boids are considered
+        max_neighbors = self.params.get('max_neighbors')
+        if max_neighbors:
+            self.update_nearest(max_neighbors)
+            return
+
         for boid in self.boids:
             xpos_avg, ypos_avg, xvel_avg, yvel_avg = 0, 0, 0, 0
             close_dx, close_dy = 0, 0
@@ -44,7 +57,7 @@ class BoidSimulation:
                         xvel_avg += other.vx
                         yvel_avg += other.vy
                         neighboring_boids += 1
-            
+
             if neighboring_boids > 0:
                 xpos_avg /= neighboring_boids
                 ypos_avg /= neighboring_boids
@@ -59,19 +72,95 @@ class BoidSimulation:
             boid.vx += close_dx * self.params['avoid_factor']
             boid.vy += close_dy * self.params['avoid_factor']
 
-            if boid.x < 0 or boid.x > self.width:
-                boid.vx *= -1
-            if boid.y < 0 or boid.y > self.height:
-                boid.vy *= -1
+            self.limit_and_move(boid)
+
+    def update_nearest(self, k):
+        """Steer each boid using only its k nearest visible neighbors.
+
+        Boids are updated one at a time in place, in the same order as the
+        metric update, so with k >= the flock size both give the same result;
+        the arrays below are refreshed after each boid moves. The k nearest
+        candidates are picked with np.argpartition, which keeps the steering
+        work per boid at O(k) no matter how dense the flock gets.
+        """
+        xs = np.array([boid.x for boid in self.boids])
+        ys = np.array([boid.y for boid in self.boids])
+        vxs = np.array([boid.vx for boid in self.boids])
+        vys = np.array([boid.vy for boid in self.boids])
+
+        visual_squared = self.params['visual_range']**2
+        protected_squared = self.params['protected_range']**2
+
+        for i, boid in enumerate(self.boids):
+            dx = xs[i] - xs
+            dy = ys[i] - ys
+            distance_squared = dx**2 + dy**2
+            distance_squared[i] = np.inf  # A boid is not its own neighbor
+
+            candidates = np.flatnonzero(distance_squared < visual_squared)
+            if len(candidates) > k:
+                nearest = np.argpartition(distance_squared[candidates], k - 1)[:k]
+                candidates = candidates[nearest]
+
+            too_close = distance_squared[candidates] < protected_squared
+            close = candidates[too_close]
+            others = candidates[~too_close]
+
+            if len(others) > 0:
+                boid.vx += (xs[others].mean() - boid.x) * self.params['centering_factor']
+                boid.vy += (ys[others].mean() - boid.y) * self.params['centering_factor']
+                boid.vx += (vxs[others].mean() - boid.vx) * self.params['matching_factor']
+                boid.vy += (vys[others].mean() - boid.vy) * self.params['matching_factor']
+
+            boid.vx += dx[close].sum() * self.params['avoid_factor']
+            boid.vy += dy[close].sum() * self.params['avoid_factor']
+
+            self.limit_and_move(boid)
+            xs[i], ys[i], vxs[i], vys[i] = boid.x, boid.y, boid.vx, boid.vy
+
+    def limit_and_move(self, boid):
+        """Bounce off the edges, clamp the speed and advance one step."""
+        if boid.x < 0 or boid.x > self.width:
+            boid.vx *= -1
+        if boid.y < 0 or boid.y > self.height:
+            boid.vy *= -1
+
+        speed = np.sqrt(boid.vx**2 + boid.vy**2)
+        if speed > self.params['max_speed']:
+            boid.vx = (boid.vx / speed) * self.params['max_speed']
+            boid.vy = (boid.vy / speed) * self.params['max_speed']
+
+        if speed < self.params['min_speed']:
+            boid.vx = (boid.vx / speed) * self.params['min_speed']
+            boid.vy = (boid.vy / speed) * self.params['min_speed']
+
+        boid.x += boid.vx
+        boid.y += boid.vy
 
-            speed = np.sqrt(boid.vx**2 + boid.vy**2)
-            if speed > self.params['max_speed']:
-                boid.vx = (boid.vx / speed) * self.params['max_speed']
-                boid.vy = (boid.vy / speed) * self.params['max_speed']
+    def positions(self):
+        """All boid positions as an (n, 2) array."""
+        return np.array([(boid.x, boid.y) for boid in self.boids], dtype=np.float64).reshape(-1, 2)
 
-            if speed < self.params['min_speed']:
-                boid.vx = (boid.vx / speed) * self.params['min_speed']
-                boid.vy = (boid.vy / speed) * self.params['min_speed']
+    def checkpoint(self, path):
+        """Save boids, params, RNG state and step counter to a compressed .npz file."""
+        state = np.array([(boid.x, boid.y, boid.vx, boid.vy) for boid in self.boids],
+                         dtype=np.float64).reshape(-1, 4)
+        np.savez_compressed(
+            path,
+            state=state,
+            size=np.array([self.width, self.height]),
+            params=json.dumps(self.params),
+            rng_state=json.dumps(self.rng.bit_generator.state),
+            step_count=self.step_count,
+        )
 
-            boid.x += boid.vx
-            boid.y += boid.vy
\ No newline at end of file
+    @classmethod
+    def restore(cls, path):
+        """Rebuild a simulation from a file written by checkpoint()."""
+        with np.load(path) as data:
+            width, height = data['size'].tolist()
+            simulation = cls(0, width, height, json.loads(str(data['params'])))
+            simulation.boids = [Boid(*row) for row in data['state'].tolist()]
+            simulation.rng.bit_generator.state = json.loads(str(data['rng_state']))
+            simulation.step_count = int(data['step_count'])
+        return simulation
@@ -0,0 +1,162 @@
+import numpy as np
+
+class Chunk:
+    """Compact arrays for the boids currently inside one square tile."""
+    def __init__(self, x, y, vx, vy, last_update):
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.last_update = last_update  # Step at which each boid was last simulated
+
+class OpenWorldSimulation:
+    """Boids in an unbounded world split into hashed square chunks.
+
+    Chunks live in a dict keyed by (cx, cy) and only exist while they hold
+    boids, so memory scales with the population rather than the extent of
+    the world. Chunks farther than params['active_radius'] from self.focus
+    are only simulated every params['far_update_interval'] steps and move
+    by the elapsed steps when they do. Elapsed steps are tracked per boid,
+    so a boid that migrated into a far chunk between its updates only moves
+    for the steps since it was last simulated.
+    """
+    def __init__(self, num_boids, width, height, params, seed=None):
+        # width/height only describe the area the boids start in
+        self.params = params
+        self.chunk_size = params.get('chunk_size', params['visual_range'])
+        if self.chunk_size < params['visual_range']:
+            raise ValueError("chunk_size must be at least visual_range")
+
+        self.chunks = {}
+        self.step_count = 0
+        self.focus = (width / 2, height / 2)
+
+        self.rng = np.random.default_rng(seed)
+        x = self.rng.uniform(0, width, num_boids)
+        y = self.rng.uniform(0, height, num_boids)
+        vx = self.rng.uniform(-1, 1, num_boids)
+        vy = self.rng.uniform(-1, 1, num_boids)
+        self.insert(x, y, vx, vy, self.step_count)
+
+    def chunk_keys(self, x, y):
+        return (np.floor_divide(x, self.chunk_size).astype(np.int64),
+                np.floor_divide(y, self.chunk_size).astype(np.int64))
+
+    def insert(self, x, y, vx, vy, last_update):
+        """Add boids to whatever chunks they fall in, allocating chunks as needed.
+
+        last_update is the step each boid was last simulated at (one value or one per boid).
+        """
+        if len(x) == 0:
+            return
+        last_update = np.broadcast_to(np.asarray(last_update, dtype=np.int64), np.shape(x))
+        cx, cy = self.chunk_keys(x, y)
+        keys, inverse = np.unique(np.stack([cx, cy], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        for group, (kx, ky) in enumerate(keys):
+            members = inverse == group
+            key = (int(kx), int(ky))
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                self.chunks[key] = Chunk(x[members], y[members], vx[members], vy[members],
+                                         last_update[members])
+            else:
+                chunk.x = np.concatenate([chunk.x, x[members]])
+                chunk.y = np.concatenate([chunk.y, y[members]])
+                chunk.vx = np.concatenate([chunk.vx, vx[members]])
+                chunk.vy = np.concatenate([chunk.vy, vy[members]])
+                chunk.last_update = np.concatenate([chunk.last_update, last_update[members]])
+
+    def is_far(self, key):
+        active_radius = self.params.get('active_radius')
+        if active_radius is None:
+            return False
+        center_x = (key[0] + 0.5) * self.chunk_size
+        center_y = (key[1] + 0.5) * self.chunk_size
+        return (center_x - self.focus[0])**2 + (center_y - self.focus[1])**2 > active_radius**2
+
+    def neighborhood(self, key):
+        """Concatenate the boids of the 3x3 block of chunks around key, own chunk first."""
+        keys = [key] + [(key[0] + i, key[1] + j)
+                        for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j]
+        block = [self.chunks[k] for k in keys if k in self.chunks]
+        return (np.concatenate([c.x for c in block]), np.concatenate([c.y for c in block]),
+                np.concatenate([c.vx for c in block]), np.concatenate([c.vy for c in block]))
+
+    def update(self):
+        self.step_count += 1
+        far_interval = self.params.get('far_update_interval', 1)
+
+        # Steer every chunk that is due against the state at the start of the step
+        new_velocities = {}
+        for key, chunk in self.chunks.items():
+            if self.is_far(key) and self.step_count % far_interval:
+                continue
+            new_velocities[key] = self.steer(chunk, *self.neighborhood(key))
+
+        # Move, then migrate boids that left their chunk
+        movers = []
+        for key, (vx, vy) in new_velocities.items():
+            chunk = self.chunks[key]
+            elapsed = self.step_count - chunk.last_update
+            chunk.vx, chunk.vy = vx, vy
+            chunk.x = chunk.x + vx * elapsed
+            chunk.y = chunk.y + vy * elapsed
+            chunk.last_update = np.full(len(chunk.x), self.step_count, dtype=np.int64)
+
+            cx, cy = self.chunk_keys(chunk.x, chunk.y)
+            leaving = (cx != key[0]) | (cy != key[1])
+            if leaving.any():
+                movers.append((chunk.x[leaving], chunk.y[leaving], chunk.vx[leaving], chunk.vy[leaving]))
+                staying = ~leaving
+                chunk.x, chunk.y = chunk.x[staying], chunk.y[staying]
+                chunk.vx, chunk.vy = chunk.vx[staying], chunk.vy[staying]
+                chunk.last_update = chunk.last_update[staying]
+                if len(chunk.x) == 0:
+                    del self.chunks[key]
+
+        if movers:
+            self.insert(*(np.concatenate(parts) for parts in zip(*movers)), self.step_count)
+
+    def steer(self, chunk, bx, by, bvx, bvy):
+        """Return the new velocities for one chunk's boids given its neighborhood."""
+        p = self.params
+        n = len(chunk.x)
+        dx = chunk.x[:, None] - bx[None, :]
+        dy = chunk.y[:, None] - by[None, :]
+        distance_squared = dx**2 + dy**2
+        distance_squared[np.arange(n), np.arange(n)] = np.inf  # Own chunk comes first in the block
+
+        visible = distance_squared < p['visual_range']**2
+        k = p.get('max_neighbors')
+        if k and distance_squared.shape[1] > k:
+            nearest = np.argpartition(distance_squared, k - 1, axis=1)[:, :k]
+            in_nearest = np.zeros_like(visible)
+            in_nearest[np.arange(n)[:, None], nearest] = True
+            visible &= in_nearest
+
+        close = visible & (distance_squared < p['protected_range']**2)
+        others = visible & ~close
+        count = others.sum(axis=1)
+        has_neighbors = count > 0
+        safe_count = np.maximum(count, 1)
+
+        vx = chunk.vx.copy()
+        vy = chunk.vy.copy()
+        vx += np.where(has_neighbors, (others @ bx / safe_count - chunk.x) * p['centering_factor'], 0)
+        vy += np.where(has_neighbors, (others @ by / safe_count - chunk.y) * p['centering_factor'], 0)
+        vx += np.where(has_neighbors, (others @ bvx / safe_count - vx) * p['matching_factor'], 0)
+        vy += np.where(has_neighbors, (others @ bvy / safe_count - vy) * p['matching_factor'], 0)
+        vx += (dx * close).sum(axis=1) * p['avoid_factor']
+        vy += (dy * close).sum(axis=1) * p['avoid_factor']
+
+        speed = np.sqrt(vx**2 + vy**2)
+        limited = np.clip(speed, p['min_speed'], p['max_speed'])
+        scale = np.divide(limited, speed, out=np.ones_like(speed), where=speed > 0)
+        return vx * scale, vy * scale
+
+    def positions(self):
+        """All boid positions as an (n, 2) array."""
+        if not self.chunks:
+            return np.empty((0, 2))
+        return np.concatenate([np.stack([c.x, c.y], axis=1) for c in self.chunks.values()])
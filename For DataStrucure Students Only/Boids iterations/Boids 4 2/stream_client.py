@@ -0,0 +1,72 @@
+import socket
+import threading
+
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+import numpy as np
+
+from stream_server import STREAM, params, LENGTH, KEYFRAME, MODE_DELTA, MODE_KEYFRAMES, unpack_frame
+
+USE_DELTA = True  # Ask the server for delta-encoded frames
+
+def connect(settings=STREAM, delta=USE_DELTA):
+    family = socket.AF_UNIX if settings["unix_path"] else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    # A small receive buffer keeps the server from queuing stale frames for us (set before connecting)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, settings["socket_buffer"])
+    sock.connect(settings["unix_path"] or (settings["host"], settings["port"]))
+    sock.sendall(MODE_DELTA if delta else MODE_KEYFRAMES)
+    return sock
+
+def read_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("server closed the stream")
+        data.extend(chunk)
+    return bytes(data)
+
+def frames(sock):
+    """Yield (frame index, positions) for every frame the server sends."""
+    state = None
+    while True:
+        (length,) = LENGTH.unpack(read_exactly(sock, LENGTH.size))
+        kind, index, positions = unpack_frame(read_exactly(sock, length))
+        if kind == KEYFRAME:
+            state = positions.copy()
+        else:
+            state = state + positions.astype(np.float32)
+        yield index, state
+
+if __name__ == "__main__":
+    latest = {"index": None, "positions": np.empty((0, 2))}
+
+    def receive():
+        sock = connect()
+        try:
+            for index, positions in frames(sock):
+                latest["index"], latest["positions"] = index, positions
+        except ConnectionError:
+            pass
+        finally:
+            sock.close()
+
+    threading.Thread(target=receive, daemon=True).start()
+
+    plt.rcParams['toolbar'] = 'none'
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.set_xlim(0, params["width"])
+    ax.set_ylim(0, params["height"])
+    ax.axis('off')
+    boid_scatter = ax.scatter([], [], s=50, c="blue", marker="o")
+    title = ax.set_title("waiting for stream...")
+
+    def update(frame):
+        boid_scatter.set_offsets(latest["positions"])
+        if latest["index"] is not None:
+            title.set_text(f"step {latest['index']}")
+        return boid_scatter, title
+
+    ani = FuncAnimation(fig, update, interval=16, blit=False, cache_frame_data=False)
+    plt.show()
@@ -0,0 +1,171 @@
+import asyncio
+import socket
+import struct
+
+import numpy as np
+
+from boids_simulation import BoidSimulation
+
+# STREAM SETTINGS (shared with stream_client.py)
+STREAM = {
+    "unix_path": None,           # Path of a Unix domain socket; None = localhost TCP
+    "host": "127.0.0.1",         # TCP host (only localhost is intended)
+    "port": 8765,                # TCP port
+    "fps": 60,                   # Simulation steps published per second
+    "keyframe_interval": 60,     # Delta subscribers get a full frame at least this often
+    "socket_buffer": 1024,       # Kernel send/receive buffer in bytes; small = few stale frames in flight
+}
+
+# Simulation parameters for the streamed run
+params = {
+    "visual_range": 75,
+    "protected_range": 20,
+    "centering_factor": 0.005,
+    "avoid_factor": 0.05,
+    "matching_factor": 0.05,
+    "max_neighbors": None,
+    "max_speed": 10,
+    "min_speed": 2,
+    "width": 400,
+    "height": 300,
+    "num_boids": 150,
+    "seed": None
+}
+
+# Wire format: every frame is a uint32 length prefix followed by that many
+# bytes: a header (kind, frame index, boid count) and the position payload.
+# Keyframes carry float32 (x, y) pairs, delta frames carry float16 offsets
+# from the previous frame the same subscriber received.
+LENGTH = struct.Struct('<I')
+HEADER = struct.Struct('<BII')
+KEYFRAME = 0
+DELTA = 1
+
+# First byte a client sends after connecting
+MODE_KEYFRAMES = b'K'
+MODE_DELTA = b'D'
+
+class Subscriber:
+    def __init__(self, writer, delta):
+        self.writer = writer
+        self.delta = delta
+        self.pending = None          # Newest frame not yet sent, older ones are dropped
+        self.ready = asyncio.Event()
+        self.state = None            # Positions as the client has reconstructed them
+        self.frames_since_keyframe = 0
+        self.dropped = 0
+
+    def encode(self, index, positions, keyframe_interval):
+        positions = positions.astype(np.float32)
+        if (self.delta and self.state is not None and self.state.shape == positions.shape
+                and self.frames_since_keyframe < keyframe_interval):
+            # Deltas are taken against what the client holds, so rounding never accumulates
+            delta = (positions - self.state).astype(np.float16)
+            if np.isfinite(delta).all():
+                self.state += delta.astype(np.float32)
+                self.frames_since_keyframe += 1
+                return pack_frame(DELTA, index, delta)
+
+        self.state = positions
+        self.frames_since_keyframe = 0
+        return pack_frame(KEYFRAME, index, positions)
+
+def pack_frame(kind, index, positions):
+    payload = HEADER.pack(kind, index, len(positions)) + positions.tobytes()
+    return LENGTH.pack(len(payload)) + payload
+
+def unpack_frame(payload):
+    """Split a frame (without its length prefix) into kind, index and an (n, 2) array."""
+    kind, index, count = HEADER.unpack_from(payload)
+    dtype = np.float32 if kind == KEYFRAME else np.float16
+    positions = np.frombuffer(payload, dtype=dtype, offset=HEADER.size, count=count * 2)
+    return kind, index, positions.reshape(count, 2)
+
+class FrameServer:
+    """Publishes position frames to any number of local subscribers.
+
+    Each subscriber has its own sender task. While its socket is busy
+    (writer.drain() blocks), newer frames replace the pending one, so a
+    slow dashboard only ever skips frames and never stalls the simulation.
+    For that to happen after a few frames rather than after hundreds, the
+    asyncio write buffer is disabled and the kernel send buffer shrunk.
+    """
+    def __init__(self, settings=STREAM):
+        self.settings = settings
+        self.subscribers = set()
+        self.server = None
+        self.closing = False
+
+    async def start(self):
+        if self.settings["unix_path"]:
+            self.server = await asyncio.start_unix_server(self.handle, self.settings["unix_path"])
+        else:
+            self.server = await asyncio.start_server(self.handle, self.settings["host"], self.settings["port"])
+
+    async def close(self):
+        self.server.close()
+        # From Python 3.12.1 wait_closed() waits for every connection to be closed,
+        # so close them and wake their sender tasks (idle in ready.wait()) to exit
+        self.closing = True
+        for subscriber in self.subscribers:
+            subscriber.writer.close()
+            subscriber.ready.set()
+        await self.server.wait_closed()
+
+    def publish(self, index, positions):
+        for subscriber in self.subscribers:
+            if subscriber.pending is not None:
+                subscriber.dropped += 1
+            subscriber.pending = (index, positions)
+            subscriber.ready.set()
+
+    async def handle(self, reader, writer):
+        try:
+            mode = await reader.readexactly(1)
+        except asyncio.IncompleteReadError:
+            writer.close()
+            return
+
+        # drain() only blocks once these buffers are full, and every frame queued
+        # in them reaches the client no matter how stale it is by then
+        writer.transport.set_write_buffer_limits(high=0)
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.settings["socket_buffer"])
+
+        subscriber = Subscriber(writer, delta=(mode == MODE_DELTA))
+        self.subscribers.add(subscriber)
+        try:
+            while True:
+                await subscriber.ready.wait()
+                subscriber.ready.clear()
+                if self.closing:
+                    break
+                index, positions = subscriber.pending
+                subscriber.pending = None
+                writer.write(subscriber.encode(index, positions, self.settings["keyframe_interval"]))
+                await writer.drain()  # Backpressure: wait for the client to catch up
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            writer.close()
+
+async def run(simulation, server, fps):
+    """Step the simulation on a worker thread and publish every frame."""
+    await server.start()
+    try:
+        while True:
+            await asyncio.to_thread(simulation.update)
+            server.publish(simulation.step_count, simulation.positions())
+            await asyncio.sleep(1 / fps)
+    finally:
+        await server.close()
+
+if __name__ == "__main__":
+    simulation = BoidSimulation(params["num_boids"], params["width"], params["height"], params,
+                                seed=params["seed"])
+    try:
+        asyncio.run(run(simulation, FrameServer(STREAM), STREAM["fps"]))
+    except KeyboardInterrupt:
+        pass
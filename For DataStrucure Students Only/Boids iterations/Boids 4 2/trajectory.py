@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+
+from boids_simulation import BoidSimulation
+
+# RECORDING SETTINGS
+RECORDING = {
+    "path": "trajectory.npz",    # Where the compressed recording is written
+    "frames": 500,               # Number of simulation steps to record
+    "keyframe_interval": 50,     # Store a full frame every N frames (None = only the first)
+    "margin_speeds": 5,          # Pad the quantized range by this many max_speeds around the world
+}
+
+# Simulation parameters for the recorded run
+params = {
+    "visual_range": 75,
+    "protected_range": 20,
+    "centering_factor": 0.005,
+    "avoid_factor": 0.05,
+    "matching_factor": 0.05,
+    "max_neighbors": None,
+    "max_speed": 10,
+    "min_speed": 2,
+    "width": 400,
+    "height": 300,
+    "num_boids": 150,
+    "seed": 0
+}
+
+QUANT_MAX = 65535  # Positions are stored as 16-bit fixed point inside the padded world bounds
+
+class TrajectoryRecorder:
+    """Collects frames as quantized keyframes and frame-to-frame deltas.
+
+    Positions are mapped to uint16 over the world box padded by `margin` on
+    every side, since boids overshoot the edges before turning back. Anything
+    still outside the padded range is clipped and counted separately. Deltas
+    are taken modulo 2**16 between quantized frames, so decoding is exact and
+    the only loss is the quantization step itself.
+    """
+    def __init__(self, width, height, keyframe_interval=None, margin=0.0):
+        self.lower = np.array([-margin, -margin], dtype=np.float64)
+        self.upper = np.array([width + margin, height + margin], dtype=np.float64)
+        self.keyframe_interval = keyframe_interval
+        self.frames = []
+        self.previous = None
+        self.quantization_error = 0.0  # Largest error of positions inside the range
+        self.clip_error = 0.0          # Largest error of positions clipped to the range
+        self.clipped = 0               # Number of clipped positions
+
+    def quantize(self, positions):
+        scaled = np.clip((positions - self.lower) / (self.upper - self.lower), 0.0, 1.0) * QUANT_MAX
+        return np.rint(scaled).astype(np.uint16)
+
+    def record(self, positions):
+        positions = np.asarray(positions, dtype=np.float64)
+        if self.previous is not None and positions.shape != self.previous.shape:
+            raise ValueError("the number of boids must stay the same during a recording")
+
+        quantized = self.quantize(positions)
+        error = np.abs(dequantize(quantized, self.lower, self.upper) - positions).max(axis=1, initial=0.0)
+        outside = ((positions < self.lower) | (positions > self.upper)).any(axis=1)
+        self.quantization_error = max(self.quantization_error, float(error[~outside].max(initial=0.0)))
+        self.clip_error = max(self.clip_error, float(error[outside].max(initial=0.0)))
+        self.clipped += int(outside.sum())
+
+        index = len(self.frames)
+        if self.previous is None or (self.keyframe_interval and index % self.keyframe_interval == 0):
+            self.frames.append(quantized)
+        else:
+            self.frames.append(quantized - self.previous)  # uint16 arithmetic wraps, which is what we want
+        self.previous = quantized
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            frames=np.stack(self.frames).view(np.int16),  # Small deltas compress better as int16
+            lower=self.lower,
+            upper=self.upper,
+            keyframe_interval=self.keyframe_interval or 0,
+        )
+
+def dequantize(quantized, lower, upper):
+    return lower + quantized.astype(np.float64) / QUANT_MAX * (upper - lower)
+
+class Trajectory:
+    """Random access to a recording written by TrajectoryRecorder.save()."""
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.frames = data['frames'].view(np.uint16)
+            self.lower = data['lower']
+            self.upper = data['upper']
+            self.keyframe_interval = int(data['keyframe_interval'])
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame(self, index):
+        """Decode one frame by summing deltas from the nearest keyframe before it."""
+        if not 0 <= index < len(self.frames):
+            raise IndexError(f"frame {index} out of range for a recording of {len(self.frames)} frames")
+        key = index - index % self.keyframe_interval if self.keyframe_interval else 0
+        quantized = self.frames[key:index + 1].sum(axis=0, dtype=np.uint16)
+        return dequantize(quantized, self.lower, self.upper)
+
+def raw_size(recorder):
+    """Bytes the same frames would take as float64 (x, y) pairs."""
+    return sum(frame.size for frame in recorder.frames) * 8
+
+if __name__ == "__main__":
+    simulation = BoidSimulation(params["num_boids"], params["width"], params["height"], params,
+                                seed=params["seed"])
+    recorder = TrajectoryRecorder(params["width"], params["height"], RECORDING["keyframe_interval"],
+                                  margin=RECORDING["margin_speeds"] * params["max_speed"])
+    for _ in range(RECORDING["frames"]):
+        simulation.update()
+        recorder.record(simulation.positions())
+    recorder.save(RECORDING["path"])
+
+    stored = os.path.getsize(RECORDING["path"])
+    print(f"Recorded {RECORDING['frames']} frames of {params['num_boids']} boids to {RECORDING['path']}")
+    print(f"Raw float64 positions: {raw_size(recorder)} bytes, stored: {stored} bytes")
+    print(f"Compression ratio: {raw_size(recorder) / stored:.1f}x")
+    print(f"Maximum quantization error: {recorder.quantization_error:.5f}")
+    if recorder.clipped:
+        print(f"Clipped {recorder.clipped} positions outside the padded range "
+              f"(maximum error {recorder.clip_error:.5f}); raise margin_speeds to avoid this")
@@ -12,6 +12,7 @@ params = {
     "centering_factor": 0.005,   # How strongly boids move to the center of their neighbors
     "avoid_factor": 0.05,        # How strongly boids avoid close neighbors
     "matching_factor": 0.05,     # How strongly boids match velocities with neighbors
+    "max_neighbors": None,       # Only react to the k nearest boids (e.g. 7, like starlings); None = all in range
 
     # Speed Limits
     "max_speed": 10,             # Maximum speed a boid can reach
@@ -20,11 +21,13 @@ params = {
     # World Settings
     "width": 400,                # Width of the simulation area
     "height": 300,               # Height of the simulation area
-    "num_boids": 150             # Number of boids in the simulation
+    "num_boids": 150,            # Number of boids in the simulation
+    "seed": None                 # Set to an integer for reproducible runs
 }
 
 # Create the simulation
-simulation = BoidSimulation(params["num_boids"], params["width"], params["height"], params)
+simulation = BoidSimulation(params["num_boids"], params["width"], params["height"], params,
+                            seed=params["seed"])
 
 # Visualization setup
 plt.rcParams['toolbar'] = 'none'  # Disable toolbar
@@ -0,0 +1,119 @@
+import json
+import os
+
+import pygame
+
+from sprites import bake
+
+# Sprite Atlas
+class SpriteAtlas:
+    """Every sprite the campfire draws, packed into one surface.
+
+    Sprites are requested with add() and created by build(), which loads
+    and scales each source image, bakes its scale and alpha variants and
+    packs them all into rows of one atlas surface. get() copies the
+    variants back out, since pygame blits from standalone surfaces faster
+    than from subsurfaces or with an area rect.
+
+    With a cache_dir, the packed atlas and the rects of every variant are
+    saved to disk, keyed by the requests and the source files' mtimes.
+    Later launches load that one image instead of decoding, scaling and
+    baking each source again.
+    """
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_dir=None, max_width=2048, padding=1):
+        self.cache_dir = cache_dir
+        self.max_width = max_width  # Rows wrap at this width
+        self.padding = padding      # Empty pixels between sprites
+        self.requests = {}          # name -> (path, size, scales, alphas)
+        self.rects = {}             # name -> [scale][alpha] -> (x, y, width, height)
+        self.surface = None
+        self.from_cache = False
+
+    def add(self, name, path, size, scales=(1.0,), alphas=(255,)):
+        """Request `path` scaled to `size`, baked at each relative scale and alpha."""
+        self.requests[name] = (path, tuple(size), tuple(scales), tuple(alphas))
+
+    def get(self, name):
+        """The variants of a sprite as [scale][alpha] surfaces cut from the atlas."""
+        return [[self.surface.subsurface(rect).copy() for rect in row] for row in self.rects[name]]
+
+    def build(self):
+        key = self.cache_key()
+        self.from_cache = self.load_cache(key)
+        if not self.from_cache:
+            self.pack(self.bake_all())
+            self.save_cache(key)
+        return self
+
+    def cache_key(self):
+        """Everything the atlas depends on; a cached atlas is reused only if this matches."""
+        sprites = [[name, path, os.stat(path).st_mtime_ns, size, scales, alphas]
+                   for name, (path, size, scales, alphas) in sorted(self.requests.items())]
+        key = {'version': self.CACHE_VERSION, 'max_width': self.max_width,
+               'padding': self.padding, 'sprites': sprites}
+        return json.loads(json.dumps(key))  # Same shape as the copy read back from disk
+
+    def bake_all(self):
+        """Load, scale and bake every request. Returns name -> [scale][alpha] surfaces."""
+        baked = {}
+        for name, (path, size, scales, alphas) in self.requests.items():
+            image = pygame.transform.scale(pygame.image.load(path).convert_alpha(), size)
+            baked[name] = [[bake(image, scale, alpha) for alpha in alphas] for scale in scales]
+        return baked
+
+    def pack(self, baked):
+        """Place the baked surfaces in rows, tallest first, and blit them into the atlas."""
+        surfaces = [(name, i, j, surface)
+                    for name, rows in baked.items()
+                    for i, row in enumerate(rows)
+                    for j, surface in enumerate(row)]
+        surfaces.sort(key=lambda item: item[3].get_height(), reverse=True)
+
+        placed = []
+        x = y = row_height = width = 0
+        for name, i, j, surface in surfaces:
+            w, h = surface.get_size()
+            if x > 0 and x + w > self.max_width:
+                x, y, row_height = 0, y + row_height + self.padding, 0
+            placed.append((name, i, j, surface, (x, y, w, h)))
+            x += w + self.padding
+            row_height = max(row_height, h)
+            width = max(width, x)
+
+        self.surface = pygame.Surface((max(1, width), max(1, y + row_height)), pygame.SRCALPHA)
+        self.surface = self.surface.convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+        self.rects = {name: [[None] * len(row) for row in rows] for name, rows in baked.items()}
+        for name, i, j, surface, rect in placed:
+            self.surface.blit(surface, rect[:2], special_flags=pygame.BLEND_RGBA_MAX)
+            self.rects[name][i][j] = rect
+
+    def cache_paths(self):
+        return os.path.join(self.cache_dir, 'atlas.png'), os.path.join(self.cache_dir, 'atlas.json')
+
+    def load_cache(self, key):
+        if self.cache_dir is None:
+            return False
+        image_path, index_path = self.cache_paths()
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            if index['key'] != key:
+                return False
+            self.surface = pygame.image.load(image_path).convert_alpha()
+        except (OSError, ValueError, KeyError, pygame.error):
+            return False  # Missing or unreadable cache: rebuild it
+        self.rects = {name: [[tuple(rect) for rect in row] for row in rows]
+                      for name, rows in index['rects'].items()}
+        return True
+
+    def save_cache(self, key):
+        if self.cache_dir is None:
+            return
+        image_path, index_path = self.cache_paths()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pygame.image.save(self.surface, image_path)
+        with open(index_path, 'w') as f:
+            json.dump({'key': key, 'rects': self.rects}, f)
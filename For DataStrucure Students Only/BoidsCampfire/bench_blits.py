@@ -0,0 +1,42 @@
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window needed
+
+import numpy as np
+import pygame
+
+from sprites import SpriteCache, draw_each, draw_batched
+
+# Benchmark Settings
+WIDTH, HEIGHT = 1600, 1200
+EMBER_IMAGE_PATH = 'Ember.png'
+EMBER_SCALE = (50, 50)
+MAX_OPACITY = 230
+EMBER_COUNTS = (500, 5000, 50000)
+FRAMES = 20
+
+def time_draw(draw, screen, cache, xs, ys, levels):
+    """Average seconds per frame for one draw function."""
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        draw(screen, cache, xs, ys, levels)
+    return (time.perf_counter() - start) / FRAMES
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    image = pygame.transform.scale(pygame.image.load(EMBER_IMAGE_PATH).convert_alpha(), EMBER_SCALE)
+    cache = SpriteCache(image, 32, MAX_OPACITY)
+    rng = np.random.default_rng(0)
+
+    print(f"{'embers':>8} {'blit each (ms)':>15} {'blits (ms)':>11} {'speedup':>8}")
+    for count in EMBER_COUNTS:
+        xs = rng.integers(0, WIDTH, count)
+        ys = rng.integers(0, HEIGHT, count)
+        levels = cache.alpha_index(rng.uniform(0, MAX_OPACITY, count))
+        each = time_draw(draw_each, screen, cache, xs, ys, levels)
+        batched = time_draw(draw_batched, screen, cache, xs, ys, levels)
+        print(f"{count:>8} {each * 1000:>15.2f} {batched * 1000:>11.2f} {each / batched:>7.2f}x")
+
+    pygame.quit()
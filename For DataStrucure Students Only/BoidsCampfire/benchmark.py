@@ -0,0 +1,75 @@
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window needed
+
+import pygame
+
+from campfire import Config, CampfireSimulation, CampfireRenderer
+from double_buffer import FrameSnapshot
+
+# Benchmark Settings
+FRAMES = 120
+SEED = 0
+EMBER_COUNTS = (500, 5000, 50000)
+
+# Renderer Variants (each one is the normal Config with a few settings changed)
+class BlitEach(Config):
+    EMBER_RENDERER = 'blit_each'
+
+class Sprites(Config):
+    EMBER_RENDERER = 'sprites'
+
+class SpritesDirtyRects(Config):
+    EMBER_RENDERER = 'sprites'
+    DIRTY_RECTS = True
+
+class Splat(Config):
+    EMBER_RENDERER = 'splat'
+
+VARIANTS = {
+    'blit each': BlitEach,
+    'sprites': Sprites,
+    'sprites + dirty rects': SpritesDirtyRects,
+    'splat': Splat,
+}
+
+def run(config, screen):
+    """Run FRAMES frames on a fixed clock; returns (embers stepped, sim seconds, draw seconds)."""
+    simulation = CampfireSimulation(config, seed=SEED)
+    renderer = CampfireRenderer(screen, config)
+    snapshot = FrameSnapshot(config.MAX_BOIDS)
+    stepped = sim_time = draw_time = 0
+
+    for frame in range(FRAMES):
+        current_time = frame * 1000 // config.FPS
+
+        start = time.perf_counter()
+        stepped += simulation.step(snapshot, current_time)
+        middle = time.perf_counter()
+        changed_rects = renderer.draw(snapshot)
+        if changed_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(changed_rects)
+        end = time.perf_counter()
+
+        sim_time += middle - start
+        draw_time += end - middle
+    return stepped, sim_time, draw_time
+
+if __name__ == "__main__":
+    pygame.init()
+    screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
+
+    print(f"{FRAMES} frames per run, seed {SEED}")
+    print(f"{'embers':>8} {'renderer':<22} {'particles/s':>12} {'sim (ms)':>9} {'draw (ms)':>10}")
+    for count in EMBER_COUNTS:
+        for name, variant in VARIANTS.items():
+            # Keep the fire topped up to `count` embers for the whole run
+            config = type(variant.__name__, (variant,), {'MAX_BOIDS': count, 'NUM_CONTINUOUS_EMBERS': count})
+            stepped, sim_time, draw_time = run(config, screen)
+            print(f"{count:>8} {name:<22} {stepped / sim_time:>12,.0f} "
+                  f"{sim_time / FRAMES * 1000:>9.2f} {draw_time / FRAMES * 1000:>10.2f}")
+
+    pygame.quit()
@@ -0,0 +1,317 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pygame
+
+from particles import ParticlePool
+from sprites import SpriteCache, alpha_steps, draw_batched, draw_each
+from assets import SpriteAtlas
+from splat import SplatRenderer
+from scheduler import Scheduler
+from emitters import FireScene
+from flocking import EmberFlock
+from turbulence import TurbulenceField
+from dirty_rects import DirtyRects, bounding_rect
+
+# Configuration Class
+class Config:
+    # Screen Settings
+    WIDTH = 1600
+    HEIGHT = 1200
+    BACKGROUND_COLOR = (30, 30, 30)
+    FPS = 60
+    THREADED_SIMULATION = False  # Step the embers on a worker thread while the last frame draws
+    DIRTY_RECTS = False          # Only repaint and update the regions the fire and embers cover
+    PROFILER_OVERLAY = False     # Show per-phase frame times (F3 toggles it while running)
+
+    # Campfire Settings
+    CAMPFIRE_IMAGE_PATH = 'myFire.png'  # Path to your campfire image
+    CAMPFIRE_SCALE = (400, 300)         # Scale of the campfire image
+    CAMPFIRE_OFFSET_Y = 100              # Distance from the bottom
+
+    # Ember Settings
+    EMBER_IMAGE_PATH = 'Ember.png'      # Path to your ember image
+    EMBER_SCALE = (50, 50)              # Scale of the ember image
+    MAX_OPACITY = 230                   # Maximum alpha value for embers (0 to 255)
+    MAX_LIFETIME = 250                  # Maximum lifetime for embers
+    EMBER_ALPHA_LEVELS = 32             # Number of pre-rendered opacity steps
+    EMBER_SCALES = (1.0,)               # Sizes (relative to EMBER_SCALE) embers shrink through as they fade
+    ATLAS_CACHE_DIR = 'atlas_cache'     # Where the packed sprite atlas is cached (None = rebuild every launch)
+    EMBER_RENDERER = 'sprites'          # 'sprites', 'blit_each' (one blit per ember) or 'splat' (additive glow)
+    SPLAT_RADIUS = 8                    # Glow kernel radius for the splat renderer
+    SPLAT_COLOR = (255, 120, 30)        # Glow tint for the splat renderer
+    FLICKER = 0.05                      # Random velocity jitter per frame
+
+    # Burst Settings
+    BURST_TYPES = {
+        'small': {'num': 20, 'velocity_range': (-1, 1, -3, -1), 'lifetime_range': (100, 150)},
+        'medium': {'num': 50, 'velocity_range': (-2, 2, -4, -2), 'lifetime_range': (150, 200)},
+        'big': {'num': 80, 'velocity_range': (-3, 3, -5, -3), 'lifetime_range': (200, 250)},
+    }
+    BURST_INTERVALS = {
+        'small': 3000,   # milliseconds
+        'medium': 7000,
+        'big': 11000,
+    }
+    BURST_JITTER = 0     # Random +/- milliseconds added to each burst interval
+
+    # Ember Generation Settings
+    NUM_CONTINUOUS_EMBERS = 100
+    CONTINUOUS_EMBER_VX_RANGE = (-1, 1)
+    CONTINUOUS_EMBER_VY_RANGE = (-3, -1)
+    CONTINUOUS_EMBER_LIFETIME_RANGE = (100, 200)
+    CONTINUOUS_EMBER_OFFSET_X = 30
+    CONTINUOUS_EMBER_OFFSET_Y = 50
+
+    # Movement Scalars
+    HEIGHT_SCALAR = 1.0    # Controls vertical movement
+    ALIGNMENT_SCALAR = 1.0 # Controls horizontal spread
+
+    # Flocking Settings (embers steer like boids when FLOCKING is on)
+    FLOCKING = False
+    FLOCK_RADIUS = 40              # How far an ember sees its neighbors
+    FLOCK_COHESION = 0.002         # Pull toward the center of nearby embers
+    FLOCK_ALIGNMENT = 0.03         # Match the velocity of nearby embers
+    FLOCK_SEPARATION = 0.02        # Push away from embers that are too close
+    FLOCK_SEPARATION_RADIUS = 12   # How close is "too close"
+    FLOCK_MAX_PER_CELL = 16        # Cap on embers checked per grid cell for separation
+    BUOYANCY = 0.02                # Upward acceleration per frame
+    FLOCK_MAX_SPEED = 5            # Speed limit while flocking
+
+    # Turbulence Settings (embers drift through a curl-noise wind field instead of flickering)
+    TURBULENCE = False
+    TURBULENCE_GRID = (64, 64)     # Cells in one tile of the field
+    TURBULENCE_CELL = 16           # Pixels per cell (a 64x64 grid tiles every 1024 pixels)
+    TURBULENCE_FREQUENCY = 3       # Swirls across one tile
+    TURBULENCE_SLICES = 32         # Time slices of the animated field (1 = still air)
+    TURBULENCE_PERIOD = 8000       # Milliseconds before the animation loops
+    TURBULENCE_STRENGTH = 1.5      # Drift in pixels per frame where the wind is strongest
+
+    # Maximum Number of Embers
+    MAX_BOIDS = 500        # Prevents unlimited growth of embers (the pool handles 100k)
+
+    # Scene Settings
+    FIRE_POSITIONS = [(WIDTH // 2, HEIGHT - CAMPFIRE_OFFSET_Y)]  # World positions of the campfires
+    WORLD_WIDTH = WIDTH    # Width of the world; make it larger than WIDTH to pan with left/right
+    CAMERA_SPEED = 10      # Pixels the camera pans per frame
+    CULL_MARGIN = 200      # Things this far outside the view are still simulated and drawn
+
+    # Replay Settings
+    SEED = None            # Seed for the simulation's random numbers (None = different every run)
+    FIXED_STEP = False     # Advance the clock by FIXED_DT every frame instead of following wall time
+    FIXED_DT = 1000 / FPS  # Simulated milliseconds per frame in fixed-step mode
+    RECORD_PATH = None     # Write an event log here (forces FIXED_STEP); play it back with replay.py
+
+# Asset Paths (relative paths are looked up next to this file)
+def asset_path(path):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+# Load the Campfire and Ember Sprites into one Atlas
+def load_atlas(config):
+    cache_dir = asset_path(config.ATLAS_CACHE_DIR) if config.ATLAS_CACHE_DIR else None
+    atlas = SpriteAtlas(cache_dir)
+    atlas.add('campfire', asset_path(config.CAMPFIRE_IMAGE_PATH), config.CAMPFIRE_SCALE)
+    atlas.add('ember', asset_path(config.EMBER_IMAGE_PATH), config.EMBER_SCALE,
+              config.EMBER_SCALES, alpha_steps(config.EMBER_ALPHA_LEVELS, config.MAX_OPACITY))
+    try:
+        return atlas.build()
+    except (OSError, pygame.error) as e:
+        print(f"Unable to load images: {e}")
+        pygame.quit()
+        sys.exit()
+
+# Campfire Simulation (no window needed)
+class CampfireSimulation:
+    """Campfires, their embers and burst timers.
+
+    All randomness comes from generators seeded with `seed`, and time is
+    whatever the caller passes to step(), so two simulations built with the
+    same seed and fed the same times produce the same frames.
+    """
+    def __init__(self, config=Config, seed=None, start_time=0):
+        self.config = config
+        self.random = random.Random(seed)      # Burst timer jitter
+        self.rng = np.random.default_rng(seed)  # Ember spawning and flicker
+
+        # Define Fire Positions (one emitter per campfire, all sharing one particle pool)
+        self.embers = ParticlePool(config.MAX_BOIDS, self.rng)
+        self.scene = FireScene(self.embers, config.FIRE_POSITIONS, config.CULL_MARGIN)
+        self.camera_x = 0
+        self.scene.set_view(self.camera_x, 0, config.WIDTH, config.HEIGHT)
+        self.flock = EmberFlock(config.FLOCK_RADIUS, config.FLOCK_COHESION, config.FLOCK_ALIGNMENT,
+                                config.FLOCK_SEPARATION, config.FLOCK_SEPARATION_RADIUS,
+                                config.BUOYANCY, config.FLOCK_MAX_SPEED, config.FLOCK_MAX_PER_CELL)
+        self.turbulence = None
+        if config.TURBULENCE:
+            self.turbulence = TurbulenceField(config.TURBULENCE_GRID, config.TURBULENCE_CELL,
+                                              config.TURBULENCE_FREQUENCY, config.TURBULENCE_SLICES,
+                                              config.TURBULENCE_PERIOD, config.TURBULENCE_STRENGTH, self.rng)
+
+        # Initialize continuous embers
+        for emitter in self.scene.emitters:
+            self.generate_continuous_embers(emitter, config.NUM_CONTINUOUS_EMBERS)
+
+        # Burst Timers (each burst type is a repeating event in the scheduler)
+        self.bursts = Scheduler(self.random)
+        for burst_type, interval in config.BURST_INTERVALS.items():
+            self.bursts.every(
+                interval,
+                lambda now, burst_type=burst_type: self.burst_visible(burst_type),
+                start=start_time,
+                jitter=config.BURST_JITTER
+            )
+
+    def spawn_uniform(self, emitter, num, vx_range, vy_range, lifetime_range):
+        """Spawn up to `num` embers at an emitter with uniformly random velocity and lifetime.
+
+        The count is clamped to the emitter's room before anything is drawn,
+        and all four columns (x offset, vx, vy, lifetime) come from a single
+        Generator call that the scene copies into the pool in one block.
+        """
+        config = self.config
+        num = min(num, self.scene.room(emitter))  # Never exceed the emitter's budget
+        if num <= 0:
+            return 0
+        low = np.array((-config.CONTINUOUS_EMBER_OFFSET_X, vx_range[0], vy_range[0], lifetime_range[0]))
+        high = np.array((config.CONTINUOUS_EMBER_OFFSET_X, vx_range[1], vy_range[1], lifetime_range[1]))
+        offset_x, vx, vy, lifetime = (low + self.rng.random((num, 4)) * (high - low)).T
+        return self.scene.spawn(
+            emitter,
+            emitter.x + offset_x,
+            emitter.y - config.CONTINUOUS_EMBER_OFFSET_Y,
+            vx * config.ALIGNMENT_SCALAR,
+            vy * config.HEIGHT_SCALAR,
+            lifetime
+        )
+
+    # Function to generate a burst of embers
+    def generate_burst(self, burst_type, emitter):
+        burst_config = self.config.BURST_TYPES.get(burst_type)
+        if not burst_config:
+            return 0
+        vx_min, vx_max, vy_min, vy_max = burst_config['velocity_range']
+        return self.spawn_uniform(emitter, burst_config['num'], (vx_min, vx_max), (vy_min, vy_max),
+                                  burst_config['lifetime_range'])
+
+    # Function to generate continuous embers
+    def generate_continuous_embers(self, emitter, num=1):
+        config = self.config
+        return self.spawn_uniform(emitter, num, config.CONTINUOUS_EMBER_VX_RANGE,
+                                  config.CONTINUOUS_EMBER_VY_RANGE, config.CONTINUOUS_EMBER_LIFETIME_RANGE)
+
+    # Function to burst every campfire that is in view
+    def burst_visible(self, burst_type):
+        for emitter in self.scene.visible_emitters():
+            self.generate_burst(burst_type, emitter)
+
+    def move_fires(self, dy):
+        """Move every campfire up (negative) or down, keeping it on the screen."""
+        for emitter in self.scene.emitters:
+            emitter.y = min(max(emitter.y + dy, self.config.CAMPFIRE_OFFSET_Y),
+                            self.config.HEIGHT - self.config.CAMPFIRE_OFFSET_Y)
+
+    def pan_camera(self, dx):
+        """Move the view across the world, keeping it inside WORLD_WIDTH."""
+        config = self.config
+        self.camera_x = min(max(self.camera_x + dx, 0), config.WORLD_WIDTH - config.WIDTH)
+        self.scene.set_view(self.camera_x, 0, config.WIDTH, config.HEIGHT)
+
+    def step(self, snapshot, current_time):
+        """Simulate one frame and record what to draw into snapshot."""
+        config = self.config
+        embers = self.embers
+
+        # Handle bursts that are due
+        self.bursts.run_due(current_time)
+
+        # Update embers in view (position, lifetime and flicker for all of them at once)
+        visible_emitters = self.scene.visible_emitters()
+        visible = self.scene.visible_particles()
+        drawn = np.flatnonzero(visible)
+        if config.FLOCKING:
+            self.flock.apply(embers, visible)
+        embers.step(0 if self.turbulence else config.FLICKER, visible)
+
+        # Let the wind field carry the embers in view
+        if self.turbulence is not None:
+            u, v = self.turbulence.sample(embers.x[drawn], embers.y[drawn], current_time)
+            embers.x[drawn] += u
+            embers.y[drawn] += v
+
+        # Calculate alpha based on lifetime and global opacity
+        alphas = np.clip((embers.lifetime[drawn] / config.MAX_LIFETIME * config.MAX_OPACITY).astype(int),
+                         0, config.MAX_OPACITY)
+        snapshot.fill(embers.x[drawn] - self.camera_x, embers.y[drawn], alphas,
+                      [(emitter.x - self.camera_x, emitter.y) for emitter in visible_emitters])
+
+        # Remove embers whose lifetime is over or that left the world
+        embers.kill_expired(0, config.WORLD_WIDTH, 0, config.HEIGHT)
+        removed = self.scene.remove_dead()
+
+        # Replenish each campfire in view with a new continuous ember for each one it lost
+        for emitter in visible_emitters:
+            self.generate_continuous_embers(emitter, int(removed[emitter.index]))
+
+        return len(drawn)  # Number of embers simulated this frame
+
+# Campfire Renderer
+class CampfireRenderer:
+    """Draws FrameSnapshots onto a screen surface (the display mode must be set)."""
+    def __init__(self, screen, config=Config):
+        self.screen = screen
+        self.config = config
+        atlas = load_atlas(config)
+        self.fire_image = atlas.get('campfire')[0][0]
+        self.ember_sprites = SpriteCache.from_surfaces(atlas.get('ember'), config.MAX_OPACITY,
+                                                       config.EMBER_SCALES)
+        # Top-left offset that keeps each scale centered in the EMBER_SCALE box the simulation positions
+        sizes = np.array([levels[0].get_size() for levels in self.ember_sprites.surfaces])
+        self.ember_offsets = (np.array(config.EMBER_SCALE) - sizes) // 2
+        self.ember_extent = sizes.max(axis=0)  # Largest sprite, for the dirty rect
+        self.ember_splats = SplatRenderer(config.WIDTH, config.HEIGHT, config.SPLAT_RADIUS, config.SPLAT_COLOR)
+
+        # Cached background for dirty-rect rendering
+        background = pygame.Surface((config.WIDTH, config.HEIGHT)).convert()
+        background.fill(config.BACKGROUND_COLOR)
+        self.dirty_rects = DirtyRects(background)
+
+    def draw(self, snapshot):
+        """Draw a simulated frame; returns the rects to update (None = whole screen)."""
+        config = self.config
+        screen = self.screen
+        n = snapshot.count
+        xs, ys, alphas = snapshot.x[:n], snapshot.y[:n], snapshot.alpha[:n]
+        fire_rects = [self.fire_image.get_rect(center=fire_position) for fire_position in snapshot.fires]
+
+        if config.DIRTY_RECTS:
+            # Restore only what was drawn last frame (and under the fires) from the background
+            self.dirty_rects.restore(screen, fire_rects)
+        else:
+            # Fill Background
+            screen.fill(config.BACKGROUND_COLOR)
+
+        # Draw the static campfire images that are in view
+        for fire_rect in fire_rects:
+            screen.blit(self.fire_image, fire_rect)
+
+        if config.EMBER_RENDERER == 'splat':
+            # Splat a glow at the center of where the ember sprite would be
+            self.ember_splats.draw(screen,
+                                   xs + config.EMBER_SCALE[0] // 2,
+                                   ys + config.EMBER_SCALE[1] // 2,
+                                   alphas / 255)
+        else:
+            # Draw the embers using the pre-rendered opacity levels
+            draw = draw_each if config.EMBER_RENDERER == 'blit_each' else draw_batched
+            levels = self.ember_sprites.alpha_index(alphas)
+            scales = self.ember_sprites.scale_index(alphas)
+            offset_x, offset_y = self.ember_offsets[scales].T
+            draw(screen, self.ember_sprites, xs.astype(int) + offset_x, ys.astype(int) + offset_y, levels, scales)
+
+        if not config.DIRTY_RECTS:
+            return None
+        reach_x, reach_y = self.ember_offsets.min(axis=0)
+        ember_rect = bounding_rect(xs.astype(int) + reach_x, ys.astype(int) + reach_y, *self.ember_extent)
+        return self.dirty_rects.finish(fire_rects + ([ember_rect] if ember_rect else []))
@@ -0,0 +1,38 @@
+import pygame
+
+# Dirty Rectangle Tracking
+class DirtyRects:
+    """Repaints and updates only the screen regions that changed.
+
+    Each frame, whatever was drawn last frame is painted over from a cached
+    background, the new frame is drawn, and only the union of old and new
+    regions is sent to pygame.display.update().
+    """
+    def __init__(self, background):
+        self.background = background
+        self.screen_rect = background.get_rect()
+        self.previous = []
+        self.full_redraw = True  # The first frame paints and flips everything
+
+    def restore(self, screen, rects):
+        """Paint the background over last frame's regions and the given ones."""
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            return
+        for rect in self.previous + rects:
+            screen.blit(self.background, rect, rect)
+
+    def finish(self, rects):
+        """Remember this frame's regions; return what to pass to display.update (None = flip)."""
+        rects = [rect.clip(self.screen_rect) for rect in rects]
+        changed = None if self.full_redraw else self.previous + rects
+        self.previous = rects
+        self.full_redraw = False
+        return changed
+
+def bounding_rect(xs, ys, width, height):
+    """Rect covering sprites of the given size drawn at (xs, ys), or None if there are none."""
+    if len(xs) == 0:
+        return None
+    left, top = int(xs.min()), int(ys.min())
+    return pygame.Rect(left, top, int(xs.max()) - left + width, int(ys.max()) - top + height)
@@ -0,0 +1,67 @@
+import threading
+
+import numpy as np
+
+# Draw-ready copy of one simulated frame
+class FrameSnapshot:
+    def __init__(self, capacity):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.alpha = np.zeros(capacity, dtype=int)
+        self.count = 0
+        self.fires = []  # Screen positions of the campfires to draw
+
+    def fill(self, xs, ys, alphas, fires):
+        n = len(xs)
+        self.x[:n] = xs
+        self.y[:n] = ys
+        self.alpha[:n] = alphas
+        self.count = n
+        self.fires = fires
+
+# Simulation Worker Thread
+class SimulationWorker:
+    """Runs the simulation one frame ahead of the renderer on a worker thread.
+
+    The worker fills the back snapshot and then swaps it with the front one.
+    The main thread only reads the front snapshot it got from wait_frame()
+    and only asks for the next step after that, so neither side ever touches
+    a buffer the other is using. The swap itself is a single reference
+    assignment, so the buffers need no lock.
+    """
+    def __init__(self, step, capacity):
+        self.step = step  # step(snapshot, current_time) simulates one frame into snapshot
+        self.front = FrameSnapshot(capacity)
+        self.back = FrameSnapshot(capacity)
+        self.requested = threading.Event()
+        self.ready = threading.Event()
+        self.current_time = 0
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            self.requested.wait()
+            self.requested.clear()
+            if not self.running:
+                return
+            self.step(self.back, self.current_time)
+            self.front, self.back = self.back, self.front
+            self.ready.set()
+
+    def start_step(self, current_time):
+        """Let the worker simulate the next frame while the caller draws."""
+        self.current_time = current_time
+        self.requested.set()
+
+    def wait_frame(self):
+        """Block until the requested frame is done and return its snapshot."""
+        self.ready.wait()
+        self.ready.clear()
+        return self.front
+
+    def stop(self):
+        self.running = False
+        self.requested.set()
+        self.thread.join()
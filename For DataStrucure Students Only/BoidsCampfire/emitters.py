@@ -0,0 +1,64 @@
+import numpy as np
+
+# Emitter (one campfire)
+class Emitter:
+    def __init__(self, index, x, y, budget):
+        self.index = index    # Owner id written into the particle pool
+        self.x = x
+        self.y = y
+        self.budget = budget  # Maximum live embers this fire may own
+        self.count = 0        # Live embers it currently owns
+
+# Scene with several campfires sharing one particle pool
+class FireScene:
+    """Campfires that all spawn into one ParticlePool.
+
+    MAX_BOIDS is split evenly into per-emitter budgets. Emitters and
+    particles farther than `margin` outside the view rect are culled: they
+    are neither moved nor drawn (culled particles still age and expire),
+    and culled emitters do not spawn.
+    """
+    def __init__(self, pool, positions, margin=0):
+        budget = pool.capacity // max(1, len(positions))
+        self.pool = pool
+        self.emitters = [Emitter(i, x, y, budget) for i, (x, y) in enumerate(positions)]
+        self.margin = margin
+        self.view = (0, 0, 0, 0)
+
+    def set_view(self, x, y, width, height):
+        self.view = (x - self.margin, y - self.margin,
+                     x + width + self.margin, y + height + self.margin)
+
+    def in_view(self, x, y):
+        left, top, right, bottom = self.view
+        return (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+
+    def visible_emitters(self):
+        return [emitter for emitter in self.emitters if self.in_view(emitter.x, emitter.y)]
+
+    def visible_particles(self):
+        """Boolean mask over the live pool slots that are inside the view."""
+        n = self.pool.count
+        return self.in_view(self.pool.x[:n], self.pool.y[:n])
+
+    def room(self, emitter):
+        return max(0, min(emitter.budget - emitter.count, self.pool.free))
+
+    def spawn(self, emitter, x, y, vx, vy, lifetime):
+        """Spawn embers for one emitter, clamped to its budget. Returns how many were added."""
+        x, y, vx, vy, lifetime = np.broadcast_arrays(x, y, vx, vy, lifetime)
+        num = min(x.size, self.room(emitter))
+        added = self.pool.spawn(x.ravel()[:num], y.ravel()[:num], vx.ravel()[:num],
+                                vy.ravel()[:num], lifetime.ravel()[:num], owner=emitter.index)
+        emitter.count += added
+        return added
+
+    def remove_dead(self):
+        """Compact the pool after kill_expired(). Returns the number removed per emitter."""
+        n = self.pool.count
+        dead_owners = self.pool.owner[:n][~self.pool.alive[:n]]
+        removed = np.bincount(dead_owners, minlength=len(self.emitters))
+        self.pool.compact()
+        for emitter in self.emitters:
+            emitter.count -= int(removed[emitter.index])
+        return removed
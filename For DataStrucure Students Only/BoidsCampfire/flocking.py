@@ -0,0 +1,138 @@
+import numpy as np
+
+# Uniform Spatial Grid
+class SpatialGrid:
+    """Uniform grid over a set of points, rebuilt from scratch every frame.
+
+    Points are bucketed by cell key. Cell keys are laid out over the points'
+    bounding box with a one-cell border, so the keys of the 8 surrounding
+    cells are plain offsets of a point's own key. The 3x3 block of every
+    occupied cell is looked up once per cell (there are usually far fewer
+    cells than points) and spread to the points through `inverse`.
+    """
+    OFFSETS = [(ox, oy) for ox in (-1, 0, 1) for oy in (-1, 0, 1)]
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+
+    def build(self, x, y):
+        cx = np.floor(x / self.cell_size).astype(np.int64)
+        cy = np.floor(y / self.cell_size).astype(np.int64)
+        if len(cx) == 0:
+            self.stride = 1
+            self.keys = cx
+        else:
+            self.stride = int(cy.max() - cy.min()) + 3
+            self.keys = (cx - cx.min() + 1) * self.stride + (cy - cy.min() + 1)
+        self.cells, self.inverse, counts = np.unique(self.keys, return_inverse=True, return_counts=True)
+        self.inverse = self.inverse.ravel()
+
+        # Points grouped by cell; a trailing empty cell stands in for "no such cell"
+        num_cells = len(self.cells)
+        self.order = np.argsort(self.inverse, kind='stable')
+        self.counts = np.append(counts, 0)
+        self.start = np.append(np.cumsum(counts) - counts, 0)
+
+        # neighbors[o, c] = slot of the cell at OFFSETS[o] from cell c, or num_cells if it is empty
+        offsets = np.array([ox * self.stride + oy for ox, oy in self.OFFSETS])
+        wanted = self.cells + offsets[:, None]
+        slot = np.searchsorted(self.cells, wanted)
+        found = slot < num_cells
+        found[found] = self.cells[slot[found]] == wanted[found]
+        self.neighbors = np.where(found, slot, num_cells)
+
+    def block_sums(self, *values):
+        """For each point, sum every array in `values` over its 3x3 block of cells."""
+        totals = []
+        for v in values:
+            per_cell = np.bincount(self.inverse, weights=v, minlength=len(self.counts))
+            totals.append(per_cell[self.neighbors].sum(axis=0)[self.inverse])
+        return totals
+
+    def neighbor_pairs(self, max_per_cell=None):
+        """Index pairs (i, j), i != j, of points in the same or adjacent cells.
+
+        With max_per_cell, at most that many members of each neighboring cell
+        are paired with a point, which bounds the pairs at 9 * max_per_cell
+        per point however crowded a cell gets.
+        """
+        n = len(self.keys)
+        counts = self.counts[self.neighbors]
+        if max_per_cell is not None:
+            counts = np.minimum(counts, max_per_cell)
+
+        # Per point, the member count and first sorted slot of each of its 9 cells
+        counts = counts[:, self.inverse].ravel()
+        start = self.start[self.neighbors][:, self.inverse].ravel()
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        i = np.repeat(np.tile(np.arange(n), len(self.OFFSETS)), counts)
+        slots = np.repeat(start - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        j = self.order[slots]
+        distinct = i != j
+        return i[distinct], j[distinct]
+
+# Flocking Rules for Embers
+class EmberFlock:
+    """Cohesion, alignment and separation between nearby embers, plus buoyancy.
+
+    Cohesion and alignment use the embers in the surrounding 3x3 block of
+    `radius`-sized cells, summed per cell, so their cost is linear in the
+    number of embers even in dense clusters. Separation looks at exact
+    pairs on a grid of `separation_radius` cells, with at most
+    `max_per_cell` embers considered from each cell.
+    """
+    def __init__(self, radius, cohesion, alignment, separation, separation_radius,
+                 buoyancy, max_speed, max_per_cell=16):
+        self.cohesion = cohesion
+        self.alignment = alignment
+        self.separation = separation
+        self.separation_radius = separation_radius
+        self.buoyancy = buoyancy
+        self.max_speed = max_speed
+        self.max_per_cell = max_per_cell
+        self.grid = SpatialGrid(radius)
+        self.close_grid = SpatialGrid(separation_radius)
+
+    def apply(self, pool, active=None):
+        """Adjust the velocities of the live (and active) particles in the pool."""
+        n = pool.count
+        index = np.arange(n) if active is None else np.flatnonzero(active)
+        x, y = pool.x[index], pool.y[index]
+        vx, vy = pool.vx[index], pool.vy[index]
+        m = len(index)
+        if m == 0:
+            return
+
+        # Block sums include the ember itself, so take it back out
+        self.grid.build(x, y)
+        count, sum_x, sum_y, sum_vx, sum_vy = self.grid.block_sums(np.ones(m), x, y, vx, vy)
+        count -= 1
+        has_neighbors = count > 0
+        safe_count = np.maximum(count, 1)
+
+        # Cohesion: steer toward the neighbors' center
+        vx += np.where(has_neighbors, ((sum_x - x) / safe_count - x) * self.cohesion, 0)
+        vy += np.where(has_neighbors, ((sum_y - y) / safe_count - y) * self.cohesion, 0)
+
+        # Alignment: match the neighbors' average velocity
+        vx += np.where(has_neighbors, ((sum_vx - pool.vx[index]) / safe_count - vx) * self.alignment, 0)
+        vy += np.where(has_neighbors, ((sum_vy - pool.vy[index]) / safe_count - vy) * self.alignment, 0)
+
+        # Separation: push away from embers that are too close
+        self.close_grid.build(x, y)
+        i, j = self.close_grid.neighbor_pairs(self.max_per_cell)
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        close = dx**2 + dy**2 < self.separation_radius**2
+        vx += np.bincount(i[close], weights=dx[close], minlength=m) * self.separation
+        vy += np.bincount(i[close], weights=dy[close], minlength=m) * self.separation
+
+        # Buoyancy: hot embers rise (screen y grows downwards)
+        vy -= self.buoyancy
+
+        speed = np.sqrt(vx**2 + vy**2)
+        scale = np.minimum(1.0, self.max_speed / np.maximum(speed, 1e-9))
+        pool.vx[index] = vx * scale
+        pool.vy[index] = vy * scale
@@ -0,0 +1,84 @@
+import numpy as np
+
+# Particle Pool for Embers
+class ParticlePool:
+    """Fixed-capacity struct-of-arrays storage for embers.
+
+    Live particles always occupy slots [0, count). Dead particles are removed
+    by moving live ones from the tail into their slots (swap-with-last), so a
+    removal never shifts the rest of the arrays.
+    """
+    def __init__(self, capacity, rng=None):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity)
+        self.owner = np.zeros(capacity, dtype=np.int32)  # Index of the emitter that spawned it
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.count = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    @property
+    def free(self):
+        return self.capacity - self.count
+
+    def spawn(self, x, y, vx, vy, lifetime, owner=0):
+        """Append particles (arrays or scalars); anything beyond capacity is dropped.
+
+        Returns the number of particles actually added.
+        """
+        x, y, vx, vy, lifetime = np.broadcast_arrays(x, y, vx, vy, lifetime)
+        num = min(x.size, self.free)
+        start, end = self.count, self.count + num
+        self.x[start:end] = x.ravel()[:num]
+        self.y[start:end] = y.ravel()[:num]
+        self.vx[start:end] = vx.ravel()[:num]
+        self.vy[start:end] = vy.ravel()[:num]
+        self.lifetime[start:end] = lifetime.ravel()[:num]
+        self.owner[start:end] = owner
+        self.alive[start:end] = True
+        self.count = end
+        return num
+
+    def step(self, flicker, active=None):
+        """Move live particles, age them by one frame and add flicker noise.
+
+        If an `active` mask over the live slots is given, only those particles
+        move and flicker; the rest stay frozen in place but still age, so they
+        expire on schedule instead of piling up outside the view.
+        """
+        n = self.count
+        where = True if active is None else active
+        x, y, vx, vy, lifetime = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.lifetime[:n]
+        np.add(x, vx, out=x, where=where)
+        np.add(y, vy, out=y, where=where)
+        lifetime -= 1
+
+        # Add randomness to simulate flicker
+        if flicker:
+            noise = self.rng.uniform(-flicker, flicker, size=(2, n))
+            np.add(vx, noise[0], out=vx, where=where)
+            np.add(vy, noise[1], out=vy, where=where)
+
+    def kill_expired(self, left, right, top, bottom):
+        """Mark particles whose lifetime ran out or that left the area as dead."""
+        n = self.count
+        self.alive[:n] = ((self.lifetime[:n] > 0) &
+                          (self.y[:n] >= top) & (self.y[:n] <= bottom) &
+                          (self.x[:n] >= left) & (self.x[:n] <= right))
+
+    def compact(self):
+        """Fill dead slots with live particles from the tail. Returns how many died."""
+        n = self.count
+        alive = self.alive[:n]
+        new_count = int(np.count_nonzero(alive))
+        holes = np.flatnonzero(~alive[:new_count])
+        movers = new_count + np.flatnonzero(alive[new_count:n])
+        for array in (self.x, self.y, self.vx, self.vy, self.lifetime, self.owner):
+            array[holes] = array[movers]
+        self.alive[:new_count] = True
+        self.alive[new_count:n] = False
+        self.count = new_count
+        return n - new_count
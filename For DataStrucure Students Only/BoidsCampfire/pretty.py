@@ -1,211 +1,120 @@
 import pygame
 import random
 import sys
-import math  # For potential future enhancements like smooth movements
+
+from campfire import Config, CampfireSimulation, CampfireRenderer
+from double_buffer import FrameSnapshot, SimulationWorker
+from replay import EventLog
+from frame_profiler import FrameProfiler
 
 # Initialize Pygame
 pygame.init()
 
-# Configuration Class
-class Config:
-    # Screen Settings
-    WIDTH = 1600
-    HEIGHT = 1200
-    BACKGROUND_COLOR = (30, 30, 30)
-    FPS = 60
-
-    # Campfire Settings
-    CAMPFIRE_IMAGE_PATH = 'myFire.png'  # Path to your campfire image
-    CAMPFIRE_SCALE = (400, 300)         # Scale of the campfire image
-    CAMPFIRE_OFFSET_Y = 100              # Distance from the bottom
-
-    # Ember Settings
-    EMBER_IMAGE_PATH = 'Ember.png'      # Path to your ember image
-    EMBER_SCALE = (50, 50)              # Scale of the ember image
-    MAX_OPACITY = 230                   # Maximum alpha value for embers (0 to 255)
-    MAX_LIFETIME = 250                  # Maximum lifetime for embers
-
-    # Burst Settings
-    BURST_TYPES = {
-        'small': {'num': 20, 'velocity_range': (-1, 1, -3, -1), 'lifetime_range': (100, 150)},
-        'medium': {'num': 50, 'velocity_range': (-2, 2, -4, -2), 'lifetime_range': (150, 200)},
-        'big': {'num': 80, 'velocity_range': (-3, 3, -5, -3), 'lifetime_range': (200, 250)},
-    }
-    BURST_INTERVALS = {
-        'small': 3000,   # milliseconds
-        'medium': 7000,
-        'big': 11000,
-    }
-
-    # Ember Generation Settings
-    NUM_CONTINUOUS_EMBERS = 100
-    CONTINUOUS_EMBER_VX_RANGE = (-1, 1)
-    CONTINUOUS_EMBER_VY_RANGE = (-3, -1)
-    CONTINUOUS_EMBER_LIFETIME_RANGE = (100, 200)
-    CONTINUOUS_EMBER_OFFSET_X = 30
-    CONTINUOUS_EMBER_OFFSET_Y = 50
-
-    # Movement Scalars
-    HEIGHT_SCALAR = 1.0    # Controls vertical movement
-    ALIGNMENT_SCALAR = 1.0 # Controls horizontal spread
-
-    # Maximum Number of Embers
-    MAX_BOIDS = 500        # Prevents unlimited growth of embers
-
 # Initialize Screen
 screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
 pygame.display.set_caption("Campfire with Embers and Bursts")
 
-# Load and Scale Images
-def load_and_scale_image(path, scale):
-    try:
-        image = pygame.image.load(path).convert_alpha()
-        return pygame.transform.scale(image, scale)
-    except pygame.error as e:
-        print(f"Unable to load image '{path}': {e}")
-        pygame.quit()
-        sys.exit()
-
-fire_image = load_and_scale_image(Config.CAMPFIRE_IMAGE_PATH, Config.CAMPFIRE_SCALE)
-particle_image = load_and_scale_image(Config.EMBER_IMAGE_PATH, Config.EMBER_SCALE)
-
-# Define Fire Position
-fire_x = Config.WIDTH // 2
-fire_y = Config.HEIGHT - Config.CAMPFIRE_OFFSET_Y
-fire_rect = fire_image.get_rect(center=(fire_x, fire_y))
-
-# Boid Class for Embers
-class Boid:
-    def __init__(self, x, y, vx, vy, lifetime):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.lifetime = lifetime  # Tracks ember fade-out
-
-# Function to generate a burst of embers
-def generate_burst(burst_type, origin_x, origin_y, embers):
-    burst_config = Config.BURST_TYPES.get(burst_type)
-    if not burst_config:
-        return []
-
-    num = burst_config['num']
-    vx_min, vx_max, vy_min, vy_max = burst_config['velocity_range']
-    lifetime_min, lifetime_max = burst_config['lifetime_range']
-
-    new_embers = []
-    for _ in range(num):
-        # Check if adding a new ember exceeds MAX_BOIDS
-        if len(embers) + len(new_embers) >= Config.MAX_BOIDS:
-            break
-        new_embers.append(Boid(
-            origin_x + random.uniform(-Config.CONTINUOUS_EMBER_OFFSET_X, Config.CONTINUOUS_EMBER_OFFSET_X),
-            origin_y - Config.CONTINUOUS_EMBER_OFFSET_Y,
-            random.uniform(vx_min, vx_max) * Config.ALIGNMENT_SCALAR,
-            random.uniform(vy_min, vy_max) * Config.HEIGHT_SCALAR,
-            random.uniform(lifetime_min, lifetime_max)
-        ))
-    return new_embers
-
-# Function to generate a single continuous ember
-def generate_continuous_ember(origin_x, origin_y, embers):
-    if len(embers) >= Config.MAX_BOIDS:
-        return None  # Do not create more embers if at max
-
-    return Boid(
-        origin_x + random.uniform(-Config.CONTINUOUS_EMBER_OFFSET_X, Config.CONTINUOUS_EMBER_OFFSET_X),
-        origin_y - Config.CONTINUOUS_EMBER_OFFSET_Y,
-        random.uniform(*Config.CONTINUOUS_EMBER_VX_RANGE) * Config.ALIGNMENT_SCALAR,
-        random.uniform(*Config.CONTINUOUS_EMBER_VY_RANGE) * Config.HEIGHT_SCALAR,
-        random.uniform(*Config.CONTINUOUS_EMBER_LIFETIME_RANGE)
-    )
-
-# Initialize continuous embers
-embers = []
-for _ in range(Config.NUM_CONTINUOUS_EMBERS):
-    ember = generate_continuous_ember(fire_x, fire_y, embers)
-    if ember:
-        embers.append(ember)
-
-# Burst Timers
-last_burst_times = {
-    'small': pygame.time.get_ticks(),
-    'medium': pygame.time.get_ticks(),
-    'big': pygame.time.get_ticks(),
-}
+# Fixed-step mode runs on a simulated clock so the session can be recorded and replayed
+recording = Config.RECORD_PATH is not None
+fixed_step = Config.FIXED_STEP or recording
+seed = Config.SEED
+if recording and seed is None:
+    seed = random.randrange(2**32)  # A replay needs to know the seed
+log = EventLog(seed, Config.FIXED_DT)
+
+def clock_time(frame):
+    return log.time(frame) if fixed_step else pygame.time.get_ticks()
+
+def act(action, amount):
+    """Apply a player input to the simulation and log it for replays."""
+    getattr(simulation, action)(amount)
+    if recording:
+        log.record(frame, action, amount)
+
+# Create the simulation and the renderer
+simulation = CampfireSimulation(Config, seed=seed, start_time=clock_time(0))
+renderer = CampfireRenderer(screen, Config)
 
 # Simulation Loop
 clock = pygame.time.Clock()
+profiler = FrameProfiler()
+show_profiler = Config.PROFILER_OVERLAY
 running = True
+frame = 0  # Index of the next frame to simulate
+if Config.THREADED_SIMULATION:
+    # The worker simulates frame N+1 while this thread draws frame N
+    worker = SimulationWorker(simulation.step, Config.MAX_BOIDS)
+    worker.start_step(clock_time(frame))
+    frame += 1
+else:
+    snapshot = FrameSnapshot(Config.MAX_BOIDS)
 
 while running:
-    current_time = pygame.time.get_ticks()
+    profiler.begin()
+    if Config.THREADED_SIMULATION:
+        snapshot = worker.wait_frame()  # The worker is idle until start_step below
+        if recording:
+            log.add_frame(snapshot)
+        profiler.mark('simulate')
 
     # Event Handling
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            show_profiler = not show_profiler
+            renderer.dirty_rects.full_redraw = True  # Repaint the whole screen so a hidden overlay is erased
         # Add event handling for moving the campfire here if needed
 
-    # Example: Move the campfire up and down with arrow keys
+    # Example: Move the campfires up and down with arrow keys
     keys = pygame.key.get_pressed()
     if keys[pygame.K_UP]:
-        fire_y -= 5  # Move up
-        # Ensure the campfire doesn't move off the screen
-        fire_y = max(fire_y, Config.CAMPFIRE_OFFSET_Y)
+        act('move_fires', -5)  # Move up
     if keys[pygame.K_DOWN]:
-        fire_y += 5  # Move down
-        fire_y = min(fire_y, Config.HEIGHT - Config.CAMPFIRE_OFFSET_Y)
-    # Update fire_rect position
-    fire_rect.center = (fire_x, fire_y)
-
-    # Fill Background
-    screen.fill(Config.BACKGROUND_COLOR)
-
-    # Draw static campfire image
-    screen.blit(fire_image, fire_rect)
-
-    # Handle bursts
-    for burst_type, interval in Config.BURST_INTERVALS.items():
-        if current_time - last_burst_times[burst_type] >= interval:
-            new_bursts = generate_burst(burst_type, fire_x, fire_y, embers)
-            embers.extend(new_bursts)
-            last_burst_times[burst_type] = current_time
-
-    # Update and draw embers
-    for ember in embers[:]:
-        # Update position
-        ember.x += ember.vx
-        ember.y += ember.vy
-        ember.lifetime -= 1  # Reduce lifetime
-
-        # Add randomness to simulate flicker
-        ember.vx += random.uniform(-0.05, 0.05)
-        ember.vy += random.uniform(-0.05, 0.05)
-
-        # Calculate alpha based on lifetime and global opacity
-        alpha = max(0, min(Config.MAX_OPACITY, int((ember.lifetime / Config.MAX_LIFETIME) * Config.MAX_OPACITY)))
-        ember_image = particle_image.copy()
-        ember_image.set_alpha(alpha)
-
-        # Draw the ember
-        screen.blit(ember_image, (int(ember.x), int(ember.y)))
-
-        # Remove ember if lifetime is over or out of screen bounds
-        if (ember.lifetime <= 0 or
-            ember.y < 0 or ember.x < 0 or ember.x > Config.WIDTH):
-            embers.remove(ember)
-            # Replenish with a new continuous ember
-            new_continuous = generate_continuous_ember(fire_x, fire_y, embers)
-            if new_continuous:
-                embers.append(new_continuous)
+        act('move_fires', 5)  # Move down
+
+    # Pan the camera across the world with the left/right arrow keys
+    if keys[pygame.K_LEFT]:
+        act('pan_camera', -Config.CAMERA_SPEED)
+    if keys[pygame.K_RIGHT]:
+        act('pan_camera', Config.CAMERA_SPEED)
+    profiler.mark('event')
+
+    # Simulate (on the worker thread in threaded mode) and draw
+    if Config.THREADED_SIMULATION:
+        worker.start_step(clock_time(frame))
+    else:
+        simulation.step(snapshot, clock_time(frame))
+        if recording:
+            log.add_frame(snapshot)
+    frame += 1
+    profiler.mark('simulate')
+    changed_rects = renderer.draw(snapshot)
+    if show_profiler:
+        overlay_rect = profiler.draw(screen)  # Opaque, so it never needs restoring
+        if changed_rects is not None:
+            changed_rects.append(overlay_rect)
+    profiler.mark('draw')
 
     # Update the display
-    pygame.display.flip()
+    if changed_rects is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(changed_rects)
+    profiler.mark('flip')
+    profiler.end_frame()
 
     # Limit the frame rate
     clock.tick(Config.FPS)
 
+if Config.THREADED_SIMULATION:
+    worker.wait_frame()
+    worker.stop()
+
+if recording:
+    log.save(Config.RECORD_PATH)
+    print(f"Saved {len(log)} frames and {len(log.events)} inputs (seed {seed}) to {Config.RECORD_PATH}")
+
 # Clean up
 pygame.quit()
-sys.exit()
\ No newline at end of file
+sys.exit()
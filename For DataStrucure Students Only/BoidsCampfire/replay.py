@@ -0,0 +1,140 @@
+import json
+import os
+import sys
+import time
+import zlib
+
+# Replay Settings (the log path and capture folder can also be given on the command line)
+REPLAY = {
+    'path': 'campfire_log.json',  # Event log written by pretty.py with Config.RECORD_PATH
+    'capture_dir': None,          # Folder to write every frame to (None = play in a window)
+    'image_format': 'bmp',        # 'bmp' is fastest to write, 'png' is much smaller
+}
+
+# Input Event Log
+class EventLog:
+    """Everything needed to rerun a campfire session frame for frame.
+
+    The simulation is deterministic given its seed and the clock it is
+    stepped with, so the log only stores the seed, the fixed time step and
+    the inputs that moved the emitters, as [frame, action, amount] entries.
+    Bursts and continuous embers are not logged since the seed recreates
+    them. A CRC of every frame's snapshot is kept so a replay can check that
+    it produced the same frames.
+    """
+    ACTIONS = ('move_fires', 'pan_camera')
+
+    def __init__(self, seed, dt):
+        self.seed = seed
+        self.dt = dt          # Simulated milliseconds per frame
+        self.events = []      # [frame, action, amount], in frame order
+        self.checksums = []   # One per simulated frame
+        self.by_frame = None  # frame -> events, built on first apply()
+
+    def __len__(self):
+        return len(self.checksums)
+
+    def time(self, frame):
+        """Simulation clock (ms) for a frame."""
+        return frame * self.dt
+
+    def record(self, frame, action, amount):
+        self.events.append([frame, action, amount])
+
+    def add_frame(self, snapshot):
+        self.checksums.append(snapshot_checksum(snapshot))
+
+    def apply(self, simulation, frame):
+        """Replay the inputs logged for `frame` (call this before stepping it)."""
+        if self.by_frame is None:
+            self.by_frame = {}
+            for event in self.events:
+                self.by_frame.setdefault(event[0], []).append(event)
+        for _, action, amount in self.by_frame.get(frame, ()):
+            if action not in self.ACTIONS:
+                raise ValueError(f"Unknown action in event log: {action}")
+            getattr(simulation, action)(amount)
+
+    def matches(self, frame, snapshot):
+        return snapshot_checksum(snapshot) == self.checksums[frame]
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump({'seed': self.seed, 'dt': self.dt, 'events': self.events,
+                       'checksums': self.checksums}, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        log = cls(data['seed'], data['dt'])
+        log.events = data['events']
+        log.checksums = data['checksums']
+        return log
+
+def snapshot_checksum(snapshot):
+    """CRC32 of everything the renderer reads from a snapshot."""
+    n = snapshot.count
+    crc = zlib.crc32(snapshot.x[:n].tobytes())
+    crc = zlib.crc32(snapshot.y[:n].tobytes(), crc)
+    crc = zlib.crc32(snapshot.alpha[:n].tobytes(), crc)
+    return zlib.crc32(repr(snapshot.fires).encode(), crc)
+
+def replay(log, config):
+    """Rerun a logged session, yielding (frame, snapshot) after each step."""
+    from campfire import CampfireSimulation
+    from double_buffer import FrameSnapshot
+
+    simulation = CampfireSimulation(config, seed=log.seed)
+    snapshot = FrameSnapshot(config.MAX_BOIDS)
+    for frame in range(len(log)):
+        log.apply(simulation, frame)
+        simulation.step(snapshot, log.time(frame))
+        yield frame, snapshot
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        REPLAY['path'] = sys.argv[1]
+    if len(sys.argv) > 2:
+        REPLAY['capture_dir'] = sys.argv[2]
+    capture_dir = REPLAY['capture_dir']
+    if capture_dir:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Capture renders offscreen
+        os.makedirs(capture_dir, exist_ok=True)
+
+    import pygame
+    from campfire import Config, CampfireRenderer
+
+    log = EventLog.load(REPLAY['path'])
+    pygame.init()
+    screen = pygame.display.set_mode((Config.WIDTH, Config.HEIGHT))
+    pygame.display.set_caption("Campfire Replay")
+    renderer = CampfireRenderer(screen, Config)
+    clock = pygame.time.Clock()
+
+    mismatches = 0
+    start = time.perf_counter()
+    for frame, snapshot in replay(log, Config):
+        if not log.matches(frame, snapshot):
+            if mismatches == 0:
+                print(f"Frame {frame} differs from the recording (was Config changed?)")
+            mismatches += 1
+        changed_rects = renderer.draw(snapshot)
+
+        if capture_dir:
+            # Offline capture: no display updates or frame limiting, just write the frame
+            pygame.image.save(screen, os.path.join(capture_dir, f"frame_{frame:05d}.{REPLAY['image_format']}"))
+            continue
+
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            break
+        if changed_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(changed_rects)
+        clock.tick(Config.FPS)
+
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {len(log)} frames (seed {log.seed}) in {elapsed:.2f}s, "
+          f"{len(log) / elapsed:.0f} frames/s, {mismatches} mismatched")
+    pygame.quit()
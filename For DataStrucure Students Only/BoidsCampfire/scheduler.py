@@ -0,0 +1,65 @@
+import heapq
+import itertools
+import random
+
+# Event Scheduler for Bursts and Emitters
+class ScheduledEvent:
+    def __init__(self, due, callback, period=None, jitter=0):
+        self.due = due            # Time (ms) the event fires next
+        self.callback = callback  # Called with the current time
+        self.period = period      # None for one-shot events
+        self.jitter = jitter      # Random +/- offset added to each period
+        self.cancelled = False
+
+class Scheduler:
+    """Min-heap of upcoming events keyed by due time.
+
+    run_due() only pops events that are due, so a frame costs
+    O(due * log n) no matter how many emitters are registered.
+    Cancelled events are left in the heap and skipped when they surface.
+    """
+    def __init__(self, rng=None):
+        self.heap = []
+        self.sequence = itertools.count()  # Tie-breaker so events never get compared
+        self.rng = rng if rng is not None else random.Random()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, event):
+        heapq.heappush(self.heap, (event.due, next(self.sequence), event))
+        return event
+
+    def once(self, at, callback):
+        """Fire callback a single time at time `at`."""
+        return self.push(ScheduledEvent(at, callback))
+
+    def every(self, period, callback, start=0, jitter=0):
+        """Fire callback every `period` ms (+/- jitter), first at start + period."""
+        event = ScheduledEvent(start, callback, period, jitter)
+        event.due = self.next_due(event, start)
+        return self.push(event)
+
+    def cancel(self, event):
+        event.cancelled = True
+
+    def next_due(self, event, after):
+        offset = self.rng.uniform(-event.jitter, event.jitter) if event.jitter else 0
+        return after + max(1, event.period + offset)
+
+    def run_due(self, now):
+        """Fire every event due at or before `now`. Returns how many fired."""
+        fired = 0
+        while self.heap and self.heap[0][0] <= now:
+            _, _, event = heapq.heappop(self.heap)
+            if event.cancelled:
+                continue
+            event.callback(now)
+            fired += 1
+            if event.period is not None and not event.cancelled:
+                # Reschedule from the planned time, but never into the past after a long frame
+                event.due = self.next_due(event, event.due)
+                if event.due <= now:
+                    event.due = self.next_due(event, now)
+                self.push(event)
+        return fired
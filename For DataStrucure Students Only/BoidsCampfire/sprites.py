@@ -0,0 +1,70 @@
+import numpy as np
+import pygame
+
+# Sprite Cache for Embers
+class SpriteCache:
+    """Copies of one image pre-rendered at quantized alpha levels and scales.
+
+    Everything is baked once when the cache is built, so drawing an ember
+    only picks an existing surface by index instead of copying the image
+    and calling set_alpha every frame. `scales` run from a fully opaque
+    sprite to a faded one, so embers shrink as they fade.
+    """
+    def __init__(self, image, alpha_levels=32, max_alpha=255, scales=(1.0,)):
+        self.alpha_levels = alpha_levels
+        self.max_alpha = max_alpha
+        self.scales = scales
+        self.surfaces = [[bake(image, scale, alpha) for alpha in alpha_steps(alpha_levels, max_alpha)]
+                         for scale in scales]
+        self.flat = [surface for levels in self.surfaces for surface in levels]  # [scale * levels + level]
+
+    @classmethod
+    def from_surfaces(cls, surfaces, max_alpha=255, scales=(1.0,)):
+        """Wrap surfaces that were already baked ([scale][level]), e.g. by a SpriteAtlas."""
+        cache = cls.__new__(cls)
+        cache.alpha_levels = len(surfaces[0])
+        cache.max_alpha = max_alpha
+        cache.scales = scales
+        cache.surfaces = surfaces
+        cache.flat = [surface for levels in surfaces for surface in levels]
+        return cache
+
+    def alpha_index(self, alphas):
+        """Map alpha values (0..max_alpha, scalar or array) to the nearest level."""
+        levels = np.rint(np.asarray(alphas) / self.max_alpha * (self.alpha_levels - 1))
+        return np.clip(levels, 0, self.alpha_levels - 1).astype(int)
+
+    def scale_index(self, alphas):
+        """Map alpha values to the scale drawn at that opacity (the first scale when opaque)."""
+        fade = 1 - np.asarray(alphas) / self.max_alpha
+        return np.clip(np.rint(fade * (len(self.scales) - 1)), 0, len(self.scales) - 1).astype(int)
+
+    def get(self, alpha_index, scale_index=0):
+        return self.surfaces[scale_index][alpha_index]
+
+def alpha_steps(alpha_levels, max_alpha=255):
+    """The alpha value baked into each of the quantized levels."""
+    return [round(level / (alpha_levels - 1) * max_alpha) for level in range(alpha_levels)]
+
+def bake(image, scale, alpha):
+    """Return a scaled copy of image with alpha multiplied into its pixels."""
+    if scale == 1.0:
+        surface = image.copy()
+    else:
+        width, height = image.get_size()
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        surface = pygame.transform.smoothscale(image, size)
+    surface.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    return surface
+
+def draw_each(screen, cache, xs, ys, levels, scale_index=0):
+    """Draw sprites with one screen.blit call per ember (scale_index: one index or one per ember)."""
+    index = np.asarray(scale_index) * cache.alpha_levels + levels
+    for x, y, i in zip(xs.tolist(), ys.tolist(), np.broadcast_to(index, levels.shape).tolist()):
+        screen.blit(cache.flat[i], (x, y))
+
+def draw_batched(screen, cache, xs, ys, levels, scale_index=0):
+    """Draw all sprites with a single screen.blits call (scale_index: one index or one per ember)."""
+    index = np.broadcast_to(np.asarray(scale_index) * cache.alpha_levels + levels, levels.shape)
+    screen.blits(zip(map(cache.flat.__getitem__, index.tolist()), zip(xs.tolist(), ys.tolist())),
+                 doreturn=False)
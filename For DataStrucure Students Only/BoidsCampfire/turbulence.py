@@ -0,0 +1,72 @@
+import numpy as np
+
+# Curl-Noise Turbulence Field
+class TurbulenceField:
+    """Precomputed, tileable curl-noise velocity grid.
+
+    A random stream function with only low frequencies is built in Fourier
+    space and its curl taken there too, so the velocities are smooth,
+    divergence-free (embers swirl instead of bunching up) and periodic on
+    every axis: the grid tiles across the world, and with more than one
+    time slice the animation loops every `period` ms.
+
+    Sampling is trilinear (bilinear in space, linear between time slices)
+    over whole position arrays at once, using per-cell bilinear
+    coefficients so each ember needs a single table lookup.
+    """
+    def __init__(self, grid=(64, 64), cell_size=16, frequency=3, time_slices=1, period=8000,
+                 strength=1.0, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        width, height = grid
+        self.cell_size = cell_size
+        self.period = period
+        self.strength = strength
+
+        # Integer wave numbers along each axis (time, y, x)
+        kt = np.fft.fftfreq(time_slices, 1 / time_slices)[:, None, None]
+        ky = np.fft.fftfreq(height, 1 / height)[None, :, None]
+        kx = np.fft.fftfreq(width, 1 / width)[None, None, :]
+
+        # Random stream function spectrum, kept to `frequency` waves per tile (and 1 per period)
+        shape = (time_slices, height, width)
+        spectrum = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+        spectrum *= (kx**2 + ky**2 <= frequency**2) & (np.abs(kt) <= 1)
+        spectrum[:, 0, 0] = 0
+
+        # Curl of the stream function psi: (d psi / dy, -d psi / dx)
+        u = np.fft.ifftn(spectrum * 2j * np.pi * ky / height).real
+        v = np.fft.ifftn(-spectrum * 2j * np.pi * kx / width).real
+        peak = max(np.sqrt(u**2 + v**2).max(), 1e-12)
+        self.velocity = (np.stack((u, v), axis=-1) / peak).astype(np.float32)  # (time, y, x, 2)
+
+        # Bilinear coefficients per cell, so a sample is a + b*fx + c*fy + d*fx*fy from one row
+        v00 = self.velocity
+        v10 = np.roll(v00, -1, axis=2)
+        v01 = np.roll(v00, -1, axis=1)
+        v11 = np.roll(v10, -1, axis=1)
+        coefficients = np.stack((v00, v10 - v00, v01 - v00, v11 - v10 - v01 + v00), axis=-2)
+        self.coefficients = coefficients.reshape(time_slices, height * width, 8) * strength
+
+    def sample(self, x, y, time=0):
+        """Velocity (u, v) at world positions (x, y) and time (ms), scaled by strength."""
+        slices, height, width, _ = self.velocity.shape
+
+        # Blend the two nearest time slices (trilinear = a blend of two bilinears)
+        gt = time / self.period * slices if slices > 1 else 0
+        t0 = int(np.floor(gt))
+        ft = gt - t0
+        table = self.coefficients[t0 % slices]
+        if ft:
+            table = table * (1 - ft) + self.coefficients[(t0 + 1) % slices] * ft
+
+        gx = np.asarray(x) / self.cell_size
+        gy = np.asarray(y) / self.cell_size
+        x0 = np.floor(gx)
+        y0 = np.floor(gy)
+        fx = gx - x0
+        fy = gy - y0
+        cell = (y0.astype(np.intp) % height) * width + x0.astype(np.intp) % width
+        a_u, a_v, b_u, b_v, c_u, c_v, d_u, d_v = table[cell].T
+        fxy = fx * fy
+        return (a_u + b_u * fx + c_u * fy + d_u * fxy,
+                a_v + b_v * fx + c_v * fy + d_v * fxy)